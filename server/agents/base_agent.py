@@ -3,8 +3,9 @@ Abstrakte Basisklasse für alle Agent-Implementierungen.
 Definiert das Interface und gemeinsame Funktionalität.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from pydantic import BaseModel
 from datetime import datetime
 import logging
@@ -94,6 +95,39 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        context: Optional[List[Dict[str, str]]] = None,
+        concurrency: int = 8,
+        **kwargs,
+    ) -> List[Union[AgentResponse, Exception]]:
+        """
+        Generiert Antworten für mehrere unabhängige Prompts nebenläufig.
+
+        Args:
+            prompts: Liste der Eingabe-Prompts
+            context: Optionaler gemeinsamer Kontext für alle Prompts
+            concurrency: Maximale Anzahl gleichzeitiger Anfragen
+            **kwargs: Zusätzliche Parameter für die Generierung
+
+        Returns:
+            Liste mit einer AgentResponse oder der aufgetretenen Exception
+            pro Prompt, in der Reihenfolge der Eingabe
+        """
+        if concurrency <= 0:
+            raise ValueError("Concurrency muss größer als 0 sein")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _generate_one(prompt: str) -> AgentResponse:
+            async with semaphore:
+                return await self.generate_response(prompt, context, **kwargs)
+
+        return await asyncio.gather(
+            *(_generate_one(prompt) for prompt in prompts), return_exceptions=True
+        )
+
     @abstractmethod
     async def health_check(self) -> Dict[str, Any]:
         """
@@ -5,7 +5,7 @@ Beispiel für die Verwendung der Agenten.
 import asyncio
 import logging
 from .base_agent import BaseAgent
-from .ollama_agent import OllamaAgent, OllamaConfig
+from .ollama_agent import OllamaAgent, OllamaConfig, close_shared_session
 
 
 async def example_basic_usage():
@@ -62,6 +62,7 @@ async def example_basic_usage():
     finally:
         # Ressourcen bereinigen
         await agent.cleanup()
+        await close_shared_session()
 
 
 async def example_with_context():
@@ -106,6 +107,7 @@ async def example_with_context():
 
     finally:
         await agent.cleanup()
+        await close_shared_session()
 
 
 async def example_agent_factory():
@@ -144,16 +146,19 @@ async def example_agent_factory():
         )
         agents.append(code_agent)
 
-        # Alle Agenten initialisieren
-        for agent in agents:
-            if await agent.initialize():
+        # Alle Agenten parallel initialisieren - sie sind voneinander unabhängig
+        results = await asyncio.gather(*(agent.initialize() for agent in agents))
+        for agent, success in zip(agents, results):
+            if success:
                 print(f"✅ {agent.name} erfolgreich initialisiert")
             else:
                 print(f"❌ {agent.name} Initialisierung fehlgeschlagen")
 
         # Gesundheitscheck für alle Agenten
-        for agent in agents:
-            health = await agent.health_check()
+        health_results = await asyncio.gather(
+            *(agent.health_check() for agent in agents)
+        )
+        for agent, health in zip(agents, health_results):
             print(f"Gesundheit von {agent.name}: {health['status']}")
 
     except Exception as e:
@@ -161,8 +166,10 @@ async def example_agent_factory():
 
     finally:
         # Alle Agenten bereinigen
-        for agent in agents:
-            await agent.cleanup()
+        await asyncio.gather(
+            *(agent.cleanup() for agent in agents), return_exceptions=True
+        )
+        await close_shared_session()
 
 
 async def main():
@@ -189,5 +196,10 @@ if __name__ == "__main__":
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    # Beispiele ausführen
-    asyncio.run(main())
+    # Beispiele ausführen, mit uvloop falls installiert (kommt mit uvicorn[standard])
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
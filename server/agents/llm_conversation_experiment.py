@@ -7,7 +7,7 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from .ollama_agent import OllamaAgent, OllamaConfig
+from .ollama_agent import OllamaAgent, OllamaConfig, close_shared_session
 
 
 class ConversationAgent(OllamaAgent):
@@ -209,6 +209,7 @@ class LLMConversationExperiment:
                 await self.agent1.cleanup()
             if self.agent2:
                 await self.agent2.cleanup()
+            await close_shared_session()
             print("✅ Bereinigung abgeschlossen!")
         except Exception as e:
             print(f"⚠️ Fehler bei der Bereinigung: {e}")
@@ -4,12 +4,25 @@ Verwendet die abstrakte BaseAgent-Klasse als Grundlage.
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List, Callable, AsyncGenerator
+import time
+import weakref
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    List,
+    Callable,
+    AsyncGenerator,
+    Iterable,
+    Tuple,
+)
 from datetime import datetime
 import json
 import aiohttp
+import orjson
 
 from .base_agent import BaseAgent, AgentConfig, AgentResponse, StreamChunk, AgentError
+from .response_cache import ResponseCache, response_cache
 
 
 class OllamaConfig(AgentConfig):
@@ -20,6 +33,87 @@ class OllamaConfig(AgentConfig):
     format: Optional[str] = None
     options: Optional[Dict[str, Any]] = None
 
+    # Connection-Pool der gemeinsam genutzten HTTP-Session
+    pool_limit: int = 0  # 0 = unbegrenzt
+    pool_limit_per_host: int = 32
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 75.0
+
+    # Gültigkeitsdauer eines Health-Check-Ergebnisses in Sekunden
+    health_check_ttl: float = 5.0
+
+
+# Eine langlebige HTTP-Session pro Event-Loop, damit Keep-Alive-Verbindungen
+# zum Ollama-Server über Agent-Instanzen und Requests hinweg wiederverwendet werden
+_shared_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_shared_session(config: OllamaConfig) -> aiohttp.ClientSession:
+    """
+    Gibt die gemeinsam genutzte HTTP-Session des laufenden Event-Loops zurück.
+
+    Die Session wird beim ersten Aufruf mit den Pool-Einstellungen aus der
+    Konfiguration erstellt und danach wiederverwendet. Die Pool-Einstellungen
+    späterer Konfigurationen im selben Event-Loop werden daher ignoriert.
+
+    Wer die Session öffnet, muss sie vor dem Ende des Event-Loops über
+    close_shared_session() schließen (API-Lifespan, Task-Cleanup, Skripte).
+
+    Args:
+        config: Ollama-Konfiguration mit den Connection-Pool-Einstellungen
+
+    Returns:
+        Gemeinsam genutzte aiohttp.ClientSession
+    """
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=config.pool_limit,
+            limit_per_host=config.pool_limit_per_host,
+            ttl_dns_cache=config.dns_cache_ttl,
+            keepalive_timeout=config.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _shared_sessions[loop] = session
+    return session
+
+
+# Letztes Health-Check-Ergebnis pro Server-URL: (Zeitpunkt, Status)
+_health_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+# Laufende deterministische Anfragen pro Event-Loop: Cache-Schlüssel -> Future
+_inflight_requests: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+async def close_shared_session() -> None:
+    """Schließt die gemeinsam genutzte HTTP-Session des laufenden Event-Loops."""
+    session = _shared_sessions.pop(asyncio.get_running_loop(), None)
+    if session and not session.closed:
+        await session.close()
+
+
+def to_wire_messages(context: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Reduziert Kontext-Nachrichten auf die Felder, die Ollama erwartet.
+
+    Einträge ohne role oder content werden übersprungen; zusätzliche Felder
+    (z.B. Zeitstempel aus der Konversationserinnerung) fallen weg.
+
+    Args:
+        context: Nachrichten mit mindestens role und content
+
+    Returns:
+        Liste von {"role", "content"}-Dictionaries
+    """
+    return [
+        {"role": msg["role"], "content": msg["content"]}
+        for msg in context
+        if "role" in msg and "content" in msg
+    ]
+
 
 class OllamaAgent(BaseAgent):
     """
@@ -42,6 +136,8 @@ class OllamaAgent(BaseAgent):
         self.format = config.format
         self.options = config.options or {}
         self.session: Optional[aiohttp.ClientSession] = None
+        self.request_timeout = aiohttp.ClientTimeout(total=config.timeout)
+        self.response_cache: ResponseCache = response_cache
 
     async def initialize(self) -> bool:
         """
@@ -51,13 +147,11 @@ class OllamaAgent(BaseAgent):
             True wenn erfolgreich initialisiert, False sonst
         """
         try:
-            # HTTP-Session erstellen
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-            )
+            # Gemeinsam genutzte HTTP-Session übernehmen
+            self.session = get_shared_session(self.config)
 
-            # Verbindung zum Ollama-Server testen
-            health_status = await self.health_check()
+            # Verbindung zum Ollama-Server testen (kurzzeitig gecacht)
+            health_status = await self.cached_health_check()
             if health_status.get("status") == "healthy":
                 self.is_initialized = True
                 self.logger.info(f"Ollama-Agent {self.name} erfolgreich initialisiert")
@@ -92,80 +186,171 @@ class OllamaAgent(BaseAgent):
 
         try:
             # Ollama-Parameter vorbereiten
-            generate_params = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,  # Kein Streaming für normale Antworten
-                "options": {
-                    "temperature": kwargs.get("temperature", self.config.temperature),
-                    "top_p": kwargs.get("top_p", 0.9),
-                    "top_k": kwargs.get("top_k", 40),
-                    "repeat_penalty": kwargs.get("repeat_penalty", 1.1),
-                },
-            }
+            generate_params = self._build_generate_params(
+                prompt, context, stream=False, **kwargs
+            )
 
-            # Max-Tokens hinzufügen wenn gesetzt
-            if self.config.max_tokens:
-                generate_params["options"]["num_predict"] = self.config.max_tokens
-
-            # System-Prompt hinzufügen wenn gesetzt
-            if self.config.system_prompt:
-                generate_params["system"] = self.config.system_prompt
-
-            # Format hinzufügen wenn gesetzt
-            if self.format:
-                generate_params["format"] = self.format
-
-            # Zusätzliche Optionen hinzufügen
-            if self.options:
-                generate_params["options"].update(self.options)
-
-            # Kontext als Nachrichten hinzufügen wenn vorhanden
-            if context:
-                messages = []
-                for msg in context:
-                    if "role" in msg and "content" in msg:
-                        messages.append(
-                            {"role": msg["role"], "content": msg["content"]}
-                        )
+            # Deterministische Anfragen (temperature == 0) aus dem Cache bedienen
+            cache_key = None
+            if generate_params["options"]["temperature"] == 0:
+                cache_key = ResponseCache.make_key(self.base_url, generate_params)
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    return AgentResponse(**cached, timestamp=datetime.now())
+
+            # HTTP-API an Ollama aufrufen; identische deterministische
+            # Anfragen teilen sich dabei einen Request
+            if cache_key is None:
+                result = await self._post_generate(generate_params)
+            else:
+                result = await self._post_generate_coalesced(cache_key, generate_params)
 
-                if messages:
-                    generate_params["messages"] = messages
+            return AgentResponse(**result, timestamp=datetime.now())
 
-            # HTTP-API an Ollama aufrufen
-            async with self.session.post(
-                f"{self.base_url}/api/generate",
-                json=generate_params,
-                headers={"Content-Type": "application/json"},
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise AgentError(
-                        f"Ollama API Fehler: {response.status} - {error_text}",
-                        self.name,
-                    )
+        except Exception as e:
+            self.invalidate_health()
+            raise AgentError(f"Fehler bei der Antwortgenerierung: {e}", self.name, e)
 
-                response_data = await response.json()
+    def _build_generate_params(
+        self,
+        prompt: str,
+        context: Optional[Iterable[Dict[str, Any]]],
+        stream: bool,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Baut die Parameter für einen Request an /api/generate.
 
-            # Antwort verarbeiten
-            content = response_data.get("response", "")
-            usage = {
-                "prompt_tokens": response_data.get("prompt_eval_count", 0),
-                "completion_tokens": response_data.get("eval_count", 0),
-                "total_tokens": response_data.get("prompt_eval_count", 0)
-                + response_data.get("eval_count", 0),
-            }
+        Args:
+            prompt: Der Eingabe-Prompt
+            context: Optionaler Kontext als Liste von Nachrichten
+            stream: Ob die Antwort gestreamt werden soll
+            **kwargs: Zusätzliche Parameter
+
+        Returns:
+            Dictionary mit den Request-Parametern
+        """
+        options = {
+            "temperature": kwargs.get("temperature", self.config.temperature),
+            "top_p": kwargs.get("top_p", 0.9),
+            "top_k": kwargs.get("top_k", 40),
+            "repeat_penalty": kwargs.get("repeat_penalty", 1.1),
+        }
+
+        # Max-Tokens hinzufügen wenn gesetzt
+        if self.config.max_tokens:
+            options["num_predict"] = self.config.max_tokens
+
+        # Zusätzliche Optionen hinzufügen
+        if self.options:
+            options.update(self.options)
+
+        generate_params = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": options,
+        }
+
+        # System-Prompt hinzufügen wenn gesetzt
+        if self.config.system_prompt:
+            generate_params["system"] = self.config.system_prompt
+
+        # Format hinzufügen wenn gesetzt
+        if self.format:
+            generate_params["format"] = self.format
+
+        # Kontext als Nachrichten hinzufügen wenn vorhanden
+        if context:
+            messages = to_wire_messages(context)
+            if messages:
+                generate_params["messages"] = messages
+
+        return generate_params
+
+    async def _post_generate(self, generate_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sendet eine Generate-Anfrage an Ollama und bereitet die Antwort auf.
+
+        Args:
+            generate_params: Vollständige Parameter für /api/generate
+
+        Returns:
+            Dictionary mit content, model, usage und finish_reason
+        """
+        async with self.session.post(
+            f"{self.base_url}/api/generate",
+            data=orjson.dumps(generate_params),
+            headers={"Content-Type": "application/json"},
+            timeout=self.request_timeout,
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise AgentError(
+                    f"Ollama API Fehler: {response.status} - {error_text}",
+                    self.name,
+                )
+
+            response_data = await response.json(loads=orjson.loads)
+
+        # Antwort verarbeiten
+        prompt_tokens = response_data.get("prompt_eval_count", 0)
+        completion_tokens = response_data.get("eval_count", 0)
+        return {
+            "content": response_data.get("response", ""),
+            "model": self.model,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+            "finish_reason": "stop" if response_data.get("done", True) else "length",
+        }
+
+    async def _post_generate_coalesced(
+        self, cache_key: str, generate_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Führt eine deterministische Anfrage höchstens einmal gleichzeitig aus.
 
-            return AgentResponse(
-                content=content,
-                model=self.model,
-                usage=usage,
-                finish_reason="stop" if response_data.get("done", True) else "length",
-                timestamp=datetime.now(),
+        Läuft bereits eine identische Anfrage im selben Event-Loop, wird auf
+        deren Ergebnis gewartet. Das Ergebnis landet anschließend im Cache.
+
+        Args:
+            cache_key: Schlüssel der Anfrage im Response-Cache
+            generate_params: Vollständige Parameter für /api/generate
+
+        Returns:
+            Dictionary mit content, model, usage und finish_reason
+        """
+        loop = asyncio.get_running_loop()
+        inflight = _inflight_requests.setdefault(loop, {})
+
+        pending = inflight.get(cache_key)
+        if pending is None:
+            # Der gemeinsame Request läuft als eigener Task, damit der Abbruch
+            # eines einzelnen Aufrufers die anderen nicht mit abbricht
+            pending = asyncio.ensure_future(
+                self._post_generate_and_cache(cache_key, generate_params)
             )
+            inflight[cache_key] = pending
 
-        except Exception as e:
-            raise AgentError(f"Fehler bei der Antwortgenerierung: {e}", self.name, e)
+            def _release(task: "asyncio.Future") -> None:
+                inflight.pop(cache_key, None)
+                if not task.cancelled():
+                    task.exception()  # Als abgerufen markieren, falls niemand wartet
+
+            pending.add_done_callback(_release)
+
+        return await asyncio.shield(pending)
+
+    async def _post_generate_and_cache(
+        self, cache_key: str, generate_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Führt eine Generate-Anfrage aus und legt das Ergebnis im Cache ab."""
+        result = await self._post_generate(generate_params)
+        self.response_cache.set(cache_key, result)
+        return result
 
     async def generate_response_stream(
         self,
@@ -194,51 +379,16 @@ class OllamaAgent(BaseAgent):
 
         try:
             # Ollama-Parameter vorbereiten
-            generate_params = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": True,  # Streaming aktivieren
-                "options": {
-                    "temperature": kwargs.get("temperature", self.config.temperature),
-                    "top_p": kwargs.get("top_p", 0.9),
-                    "top_k": kwargs.get("top_k", 40),
-                    "repeat_penalty": kwargs.get("repeat_penalty", 1.1),
-                },
-            }
-
-            # Max-Tokens hinzufügen wenn gesetzt
-            if self.config.max_tokens:
-                generate_params["options"]["num_predict"] = self.config.max_tokens
-
-            # System-Prompt hinzufügen wenn gesetzt
-            if self.config.system_prompt:
-                generate_params["system"] = self.config.system_prompt
-
-            # Format hinzufügen wenn gesetzt
-            if self.format:
-                generate_params["format"] = self.format
-
-            # Zusätzliche Optionen hinzufügen
-            if self.options:
-                generate_params["options"].update(self.options)
-
-            # Kontext als Nachrichten hinzufügen wenn vorhanden
-            if context:
-                messages = []
-                for msg in context:
-                    if "role" in msg and "content" in msg:
-                        messages.append(
-                            {"role": msg["role"], "content": msg["content"]}
-                        )
-
-                if messages:
-                    generate_params["messages"] = messages
+            generate_params = self._build_generate_params(
+                prompt, context, stream=True, **kwargs
+            )
 
             # HTTP-API an Ollama mit Streaming aufrufen
             async with self.session.post(
                 f"{self.base_url}/api/generate",
-                json=generate_params,
+                data=orjson.dumps(generate_params),
                 headers={"Content-Type": "application/json"},
+                timeout=self.request_timeout,
             ) as response:
                 if response.status != 200:
                     error_text = await response.text()
@@ -254,7 +404,7 @@ class OllamaAgent(BaseAgent):
 
                     try:
                         # JSON-Parsing für jeden Chunk
-                        chunk_data = json.loads(line.decode("utf-8"))
+                        chunk_data = orjson.loads(line)
 
                         # StreamChunk erstellen
                         content = chunk_data.get("response", "")
@@ -295,6 +445,7 @@ class OllamaAgent(BaseAgent):
                         continue
 
         except Exception as e:
+            self.invalidate_health()
             raise AgentError(f"Fehler beim Streaming: {e}", self.name, e)
 
     async def health_check(self) -> Dict[str, Any]:
@@ -313,7 +464,9 @@ class OllamaAgent(BaseAgent):
                 }
 
             # Ollama-Status abfragen
-            async with self.session.get(f"{self.base_url}/api/tags") as response:
+            async with self.session.get(
+                f"{self.base_url}/api/tags", timeout=self.request_timeout
+            ) as response:
                 if response.status == 200:
                     data = await response.json()
                     return {
@@ -336,6 +489,37 @@ class OllamaAgent(BaseAgent):
                 "timestamp": datetime.now().isoformat(),
             }
 
+    async def cached_health_check(self) -> Dict[str, Any]:
+        """
+        Führt einen Health-Check durch, sofern kein frisches Ergebnis gecacht ist.
+
+        Gesunde Ergebnisse gelten für health_check_ttl Sekunden pro Server-URL,
+        damit nicht jede neue Agent-Instanz einen eigenen Request an /api/tags
+        sendet. Fehlschläge werden nicht gecacht, damit ein kurzer Ausfall
+        nicht für die ganze TTL als "unhealthy" gemeldet wird.
+
+        Returns:
+            Dictionary mit Gesundheitsstatus-Informationen
+        """
+        cached = _health_cache.get(self.base_url)
+        if cached and time.monotonic() - cached[0] < self.config.health_check_ttl:
+            return cached[1]
+
+        health_status = await self.health_check()
+        if health_status.get("status") == "healthy":
+            _health_cache[self.base_url] = (time.monotonic(), health_status)
+        else:
+            _health_cache.pop(self.base_url, None)
+        return health_status
+
+    def invalidate_health(self) -> None:
+        """Verwirft den gecachten Health-Status nach einem fehlgeschlagenen Request."""
+        _health_cache.pop(self.base_url, None)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Gibt die aktuellen Statistiken des Response-Caches zurück."""
+        return self.response_cache.get_stats()
+
     async def list_models(self) -> List[Dict[str, Any]]:
         """
         Listet alle verfügbaren Modelle auf dem Ollama-Server auf.
@@ -347,7 +531,9 @@ class OllamaAgent(BaseAgent):
             raise AgentError("Agent nicht initialisiert", self.name)
 
         try:
-            async with self.session.get(f"{self.base_url}/api/tags") as response:
+            async with self.session.get(
+                f"{self.base_url}/api/tags", timeout=self.request_timeout
+            ) as response:
                 if response.status == 200:
                     data = await response.json()
                     return data.get("models", [])
@@ -359,6 +545,32 @@ class OllamaAgent(BaseAgent):
         except Exception as e:
             raise AgentError(f"Fehler beim Abrufen der Modelle: {e}", self.name, e)
 
+    async def preload_model(self) -> bool:
+        """
+        Lädt das Modell vorab in den Speicher des Ollama-Servers.
+
+        Ein Generate-Request ohne Prompt lädt nur das Modell, sodass die
+        erste echte Anfrage nicht auf den Modellstart warten muss.
+
+        Returns:
+            True wenn das Modell geladen wurde, False sonst
+        """
+        if not self.is_initialized:
+            raise AgentError("Agent nicht initialisiert", self.name)
+
+        try:
+            async with self.session.post(
+                f"{self.base_url}/api/generate",
+                data=orjson.dumps({"model": self.model}),
+                headers={"Content-Type": "application/json"},
+                timeout=self.request_timeout,
+            ) as response:
+                return response.status == 200
+
+        except Exception as e:
+            self.logger.warning(f"Modell {self.model} nicht vorgeladen: {e}")
+            return False
+
     async def pull_model(self, model_name: str) -> Dict[str, Any]:
         """
         Lädt ein Modell auf den Ollama-Server herunter.
@@ -374,7 +586,10 @@ class OllamaAgent(BaseAgent):
 
         try:
             async with self.session.post(
-                f"{self.base_url}/api/pull", json={"name": model_name}
+                f"{self.base_url}/api/pull",
+                data=orjson.dumps({"name": model_name}),
+                headers={"Content-Type": "application/json"},
+                timeout=self.request_timeout,
             ) as response:
                 if response.status == 200:
                     return {"status": "success", "model": model_name}
@@ -389,15 +604,12 @@ class OllamaAgent(BaseAgent):
 
     async def cleanup(self) -> None:
         """
-        Bereinigt Ressourcen und schließt die HTTP-Session.
+        Bereinigt Ressourcen und gibt die HTTP-Session frei.
+
+        Die gemeinsam genutzte Session bleibt für andere Agenten geöffnet
+        und muss vom Besitzer des Event-Loops über close_shared_session()
+        geschlossen werden.
         """
-        if self.session:
-            await self.session.close()
-            self.session = None
+        self.session = None
 
         await super().cleanup()
-
-    def __del__(self):
-        """Destruktor für die Bereinigung der Session."""
-        if self.session and not self.session.closed:
-            asyncio.create_task(self.session.close())
@@ -2,8 +2,12 @@
 Queen Agent - Ein intelligenter Agent, der andere Agenten koordiniert.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Callable, AsyncGenerator
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, Any, Optional, List, Callable, AsyncGenerator, Tuple
 from datetime import datetime
 
 from .ollama_agent import OllamaAgent, OllamaConfig
@@ -25,6 +29,38 @@ class QueenConfig(OllamaConfig):
     enable_context_awareness: bool = True
 
 
+DEFAULT_SYSTEM_PROMPT = (
+    "Du bist die Queen - eine weise, freundliche und hilfreiche Assistentin."
+)
+
+# Stil-spezifische Anpassungen
+STYLE_ENHANCEMENTS: Dict[str, str] = {
+    "friendly": "Antworte in einem freundlichen und warmen Ton.",
+    "formal": "Antworte in einem höflichen und formellen Ton.",
+    "casual": "Antworte in einem lockeren und entspannten Ton.",
+}
+
+# Kontext-basierte Anpassungen: (Schlüsselwörter, Ergänzung), erster Treffer gewinnt
+CONTEXT_ENHANCEMENTS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (
+        ("programmiere", "code", "python"),
+        " Du bist auch eine Expertin für Programmierung und Software-Entwicklung.",
+    ),
+    (
+        ("wissenschaft", "forschung", "physik"),
+        " Du bist auch eine Expertin für Wissenschaft und Forschung.",
+    ),
+)
+
+
+def _build_system_prompt(
+    base_prompt: str, response_style: str, context_enhancement: str
+) -> str:
+    """Setzt den System-Prompt aus seinen Bausteinen zusammen."""
+    style_prompt = STYLE_ENHANCEMENTS.get(response_style, "")
+    return f"{base_prompt} {style_prompt} {context_enhancement}".strip()
+
+
 class QueenAgent(OllamaAgent):
     """
     Queen-Agent mit erweiterter Chat-Funktionalität.
@@ -55,8 +91,9 @@ class QueenAgent(OllamaAgent):
         super().__init__(config)
 
         # Queen-spezifische Attribute
-        self.conversation_memory: List[Dict[str, str]] = []
+        # Ringpuffer: älteste Nachrichten fallen beim Anhängen in O(1) heraus
         self.memory_size = config.conversation_memory_size
+        self.conversation_memory: Deque[Dict[str, Any]] = deque(maxlen=self.memory_size)
         self.response_style = config.response_style
         self.context_awareness = config.enable_context_awareness
         self.queen_logger = logging.getLogger(f"{__name__}.queen")
@@ -128,7 +165,7 @@ class QueenAgent(OllamaAgent):
             # Antwort generieren
             response = await self.generate_response(
                 prompt=user_message,
-                context=(self.conversation_memory if self.context_awareness else None),
+                context=self._conversation_context(user_id, conversation_id),
                 system_prompt=enhanced_system_prompt,
                 **kwargs,
             )
@@ -196,15 +233,18 @@ class QueenAgent(OllamaAgent):
 
             # Streaming-Antwort versuchen
             try:
+                # Inhalt während des Streamings sammeln, statt die Antwort
+                # für die Erinnerung ein zweites Mal generieren zu lassen
+                response_parts: List[str] = []
                 async for chunk in self.generate_response_stream(
                     prompt=user_message,
-                    context=(
-                        self.conversation_memory if self.context_awareness else None
-                    ),
+                    context=self._conversation_context(user_id, conversation_id),
                     system_prompt=enhanced_system_prompt,
                     on_chunk=on_chunk,
                     **kwargs,
                 ):
+                    response_parts.append(chunk.content)
+
                     # Chunk weitergeben
                     yield chunk
 
@@ -213,22 +253,8 @@ class QueenAgent(OllamaAgent):
                         break
 
                 # Queen-Antwort zur Erinnerung hinzufügen (kompletter Inhalt)
-                # Da wir den kompletten Inhalt nicht haben, sammeln wir ihn
-                complete_response = ""
-                async for chunk in self.generate_response_stream(
-                    prompt=user_message,
-                    context=(
-                        self.conversation_memory if self.context_awareness else None
-                    ),
-                    system_prompt=enhanced_system_prompt,
-                    **kwargs,
-                ):
-                    complete_response += chunk.content
-                    if chunk.done:
-                        break
-
                 self._add_to_memory(
-                    "assistant", complete_response, user_id, conversation_id
+                    "assistant", "".join(response_parts), user_id, conversation_id
                 )
 
             except Exception as stream_error:
@@ -240,9 +266,7 @@ class QueenAgent(OllamaAgent):
                 # Normale Antwort generieren
                 response = await self.generate_response(
                     prompt=user_message,
-                    context=(
-                        self.conversation_memory if self.context_awareness else None
-                    ),
+                    context=self._conversation_context(user_id, conversation_id),
                     system_prompt=enhanced_system_prompt,
                     **kwargs,
                 )
@@ -416,16 +440,33 @@ class QueenAgent(OllamaAgent):
         memory_entry = {
             "role": role,
             "content": content,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),  # Epoch-Sekunden, Formatierung erst bei Bedarf
             "user_id": user_id,
             "conversation_id": conversation_id,
         }
 
+        # Die deque verwirft bei Überlauf automatisch die älteste Nachricht
         self.conversation_memory.append(memory_entry)
 
-        # Erinnerung auf maximale Größe begrenzen
-        if len(self.conversation_memory) > self.memory_size:
-            self.conversation_memory.pop(0)
+    def _conversation_context(
+        self, user_id: Optional[str], conversation_id: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Liefert die Erinnerung einer einzelnen Konversation als Kontext.
+
+        Die Queen wird von allen Requests eines Event-Loops geteilt, daher
+        dürfen nur Nachrichten desselben Benutzers und derselben Konversation
+        in den Prompt gelangen.
+        """
+        if not self.context_awareness:
+            return None
+
+        return [
+            msg
+            for msg in self.conversation_memory
+            if msg.get("user_id") == user_id
+            and msg.get("conversation_id") == conversation_id
+        ]
 
     def _clear_conversation_memory(
         self, user_id: str, conversation_id: Optional[str] = None
@@ -433,61 +474,43 @@ class QueenAgent(OllamaAgent):
         """Entfernt Konversationserinnerungen für einen bestimmten Benutzer."""
         if conversation_id:
             # Spezifische Konversation entfernen
-            self.conversation_memory = [
-                msg
-                for msg in self.conversation_memory
-                if not (
-                    msg.get("user_id") == user_id
-                    and msg.get("conversation_id") == conversation_id
-                )
-            ]
+            self.conversation_memory = deque(
+                (
+                    msg
+                    for msg in self.conversation_memory
+                    if not (
+                        msg.get("user_id") == user_id
+                        and msg.get("conversation_id") == conversation_id
+                    )
+                ),
+                maxlen=self.memory_size,
+            )
         else:
             # Alle Nachrichten des Benutzers entfernen
-            self.conversation_memory = [
-                msg for msg in self.conversation_memory if msg.get("user_id") != user_id
-            ]
+            self.conversation_memory = deque(
+                (
+                    msg
+                    for msg in self.conversation_memory
+                    if msg.get("user_id") != user_id
+                ),
+                maxlen=self.memory_size,
+            )
 
     def _enhance_system_prompt(self, user_message: str) -> str:
         """Erweitert den System-Prompt basierend auf der Benutzernachricht."""
-        base_prompt = (
-            self.config.system_prompt
-            or "Du bist die Queen - eine weise, freundliche und "
-            "hilfreiche Assistentin."
-        )
-
-        # Stil-spezifische Anpassungen
-        style_enhancements = {
-            "friendly": "Antworte in einem freundlichen und warmen Ton.",
-            "formal": "Antworte in einem höflichen und formellen Ton.",
-            "casual": "Antworte in einem lockeren und entspannten Ton.",
-        }
-
-        style_prompt = style_enhancements.get(self.response_style, "")
+        base_prompt = self.config.system_prompt or DEFAULT_SYSTEM_PROMPT
 
-        # Kontext-basierte Anpassungen
+        # Kontext-basierte Anpassungen (Nachricht nur einmal normalisieren)
+        message = user_message.lower()
         context_enhancement = ""
-        if (
-            "programmiere" in user_message.lower()
-            or "code" in user_message.lower()
-            or "python" in user_message.lower()
-        ):
-            context_enhancement = (
-                " Du bist auch eine Expertin für Programmierung und "
-                "Software-Entwicklung."
-            )
-        elif (
-            "wissenschaft" in user_message.lower()
-            or "forschung" in user_message.lower()
-            or "physik" in user_message.lower()
-        ):
-            context_enhancement = (
-                " Du bist auch eine Expertin für Wissenschaft und Forschung."
-            )
+        for keywords, enhancement in CONTEXT_ENHANCEMENTS:
+            if any(keyword in message for keyword in keywords):
+                context_enhancement = enhancement
+                break
 
-        enhanced_prompt = (
-            f"{base_prompt} {style_prompt} {context_enhancement}"
-        ).strip()
-        return enhanced_prompt
+        return _build_system_prompt(
+            base_prompt, self.response_style, context_enhancement
+        )
 
     def get_queen_status(self) -> Dict[str, Any]:
         """Gibt den aktuellen Status der Queen zurück."""
@@ -531,18 +554,48 @@ class QueenAgent(OllamaAgent):
         return self.__str__()
 
 
+# Aktive Queen-Instanzen mit Standardkonfiguration, eine pro Event-Loop
+_queen_instances: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def release_queen_instance() -> Optional[QueenAgent]:
+    """
+    Entfernt die gecachte Queen des laufenden Event-Loops.
+
+    Muss aufgerufen werden, bevor ein kurzlebiger Event-Loop (z.B. ein
+    Task-Loop der TaskEngine) beendet wird, da die Queen über ihre Session
+    den Loop referenziert und der Eintrag sonst nie verschwindet.
+
+    Returns:
+        Die entfernte Queen oder None
+    """
+    return _queen_instances.pop(asyncio.get_running_loop(), None)
+
+
 # Factory-Funktion für den Queen-Agenten
 async def get_queen_instance(config: Optional[QueenConfig] = None) -> QueenAgent:
     """
     Factory-Funktion für den Queen-Agenten.
 
+    Ohne Konfiguration wird die aktive Queen des laufenden Event-Loops
+    wiederverwendet, statt pro Request eine neue Instanz aufzubauen.
+
     Args:
         config: Optional - Queen-Konfiguration
 
     Returns:
         QueenAgent-Instanz
     """
+    loop = asyncio.get_running_loop()
+    if config is None:
+        queen = _queen_instances.get(loop)
+        if queen is not None and queen.is_queen_active:
+            return queen
+
     queen = QueenAgent(config)
     if not queen.is_queen_active:
         await queen.initialize()
+
+    if config is None and queen.is_queen_active:
+        _queen_instances[loop] = queen
     return queen
@@ -3,7 +3,7 @@ Beispiel für die Verwendung des Queen-Agenten.
 """
 
 import asyncio
-from .ollama_agent import OllamaAgent
+from .ollama_agent import OllamaAgent, close_shared_session
 
 
 async def demonstrate_chat_functionality():
@@ -267,6 +267,7 @@ async def main():
             print("\n🧹 Queen erfolgreich bereinigt")
         except Exception as e:
             print(f"⚠️  Fehler beim Bereinigen: {e}")
+        await close_shared_session()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+"""
+LRU-Cache mit TTL für deterministische Agent-Antworten.
+Wird nur für Generierungen mit temperature == 0 verwendet.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    In-Memory-Cache für Agent-Antworten.
+
+    Einträge werden nach dem LRU-Prinzip verdrängt, sobald die maximale
+    Größe erreicht ist, und laufen nach der TTL ab. Zugriffe sind über
+    einen Lock abgesichert, da die TaskEngine Agenten in mehreren Threads
+    gleichzeitig ausführt.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 300.0):
+        """
+        Initialisiert den Response-Cache.
+
+        Args:
+            max_size: Maximale Anzahl von Einträgen
+            ttl: Lebensdauer eines Eintrags in Sekunden
+        """
+        if max_size <= 0:
+            raise ValueError("Cache-Größe muss größer als 0 sein")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistiken
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(base_url: str, params: Dict[str, Any]) -> str:
+        """
+        Berechnet einen stabilen Cache-Schlüssel für Anfrageparameter.
+
+        Args:
+            base_url: URL des Servers, der die Anfrage beantwortet
+            params: Parameter der Anfrage (Modell, Prompt, Optionen, ...)
+
+        Returns:
+            SHA-256-Hexdigest der sortiert serialisierten Parameter
+        """
+        payload = json.dumps([base_url, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Holt einen Eintrag aus dem Cache.
+
+        Args:
+            key: Cache-Schlüssel
+
+        Returns:
+            Gespeicherte Antwortdaten oder None bei Miss/Ablauf
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Speichert einen Eintrag im Cache.
+
+        Args:
+            key: Cache-Schlüssel
+            value: Zu speichernde Antwortdaten
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Leert den Cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt aktuelle Statistiken des Caches zurück."""
+        with self._lock:
+            stats = self.stats.copy()
+            stats.update({"size": len(self._entries), "max_size": self.max_size})
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Globaler Cache, geteilt von allen Agent-Instanzen
+response_cache = ResponseCache()
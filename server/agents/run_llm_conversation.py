@@ -7,15 +7,11 @@ import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-
-# Füge den server-Verzeichnispfad zum Python-Pfad hinzu
 import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Relativer Import: als Modul starten (python -m agents.run_llm_conversation)
 try:
-    from .ollama_agent import OllamaAgent, OllamaConfig
+    from .ollama_agent import OllamaAgent, OllamaConfig, close_shared_session
 except ImportError as e:
     print(f"❌ Import-Fehler: {e}")
     print(
@@ -240,6 +236,7 @@ class LLMConversationExperiment:
                 await self.agent1.cleanup()
             if self.agent2:
                 await self.agent2.cleanup()
+            await close_shared_session()
             print("✅ Bereinigung abgeschlossen!")
         except Exception as e:
             print(f"⚠️ Fehler bei der Bereinigung: {e}")
@@ -5,16 +5,26 @@ FastAPI-Anwendung für das Chat-Backend.
 import json
 import logging
 import asyncio
-from contextlib import asynccontextmanager
+import orjson
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
 from typing import Dict, Any, Optional, AsyncIterator
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, APIRouter, Request
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import (
+    FastAPI,
+    WebSocket,
+    WebSocketDisconnect,
+    APIRouter,
+    Request,
+    Response,
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from core import manager
-from tasks.engine import TaskEngine
+from tasks.base import TaskInput
+from tasks.engine import TaskEngine, MessageEvent
 from tasks.console_worker import ConsoleWorker
 from agents.queen_agent import get_queen_instance
+from agents.ollama_agent import close_shared_session
 from tasks.message_tasks import MessageTaskFactory
 
 logger = logging.getLogger(__name__)
@@ -51,6 +61,10 @@ async def lifespan(app: FastAPI):
 
     await app.state.task_engine.start()
 
+    # Warm up Queen and model in the background so the first request
+    # does not wait for the health check and model load
+    app.state.warmup_task = asyncio.create_task(warmup_queen())
+
     print("\n" + "=" * 60)
     print("🚀 CHAT BACKEND STARTED WITH GLOBAL EVENT HANDLING")
     print("=" * 60)
@@ -69,34 +83,67 @@ async def lifespan(app: FastAPI):
             app.state, "console_worker", None
         )
 
+        warmup_task: Optional[asyncio.Task] = getattr(app.state, "warmup_task", None)
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+            # Wait for the warmup to let go of the session before closing it
+            with suppress(asyncio.CancelledError):
+                await warmup_task
+
         if task_engine:
             await task_engine.stop()
             logger.info("Task Engine stopped successfully")
 
+        await close_shared_session()
+
         if console_worker:
             console_worker.print_stats()
             print("\n👋 Chat Backend shutting down...")
 
 
+async def warmup_queen() -> None:
+    """Initialize the Queen once and preload its model on the Ollama server."""
+    try:
+        queen = await get_queen_instance()
+        if queen.is_queen_active and await queen.preload_model():
+            logger.info(f"Queen model {queen.model} preloaded")
+    except Exception as e:
+        logger.warning(f"Queen warmup failed: {e}")
+
+
 # -----------------------------------------------------------------------------
 # Router with all routes (HTTP + WebSocket)
 # -----------------------------------------------------------------------------
 router = APIRouter()
 
 
+API_ENDPOINTS = {
+    "chat": "/chat",
+    "chat_stream": "/chat/stream",
+    "chat_async": "/chat/async",
+    "task_status": "/tasks/{task_id}",
+    "websocket": "/ws/{client_id}",
+    "docs": "/docs",
+}
+
+
+def build_root_response(app: FastAPI) -> bytes:
+    """Serialize the static root payload once per app instance."""
+    return orjson.dumps(
+        {
+            "message": "Chat Backend API",
+            "version": getattr(app, "version", "unknown"),
+            "endpoints": API_ENDPOINTS,
+        }
+    )
+
+
 @router.get("/")
 async def root(request: Request):
-    """Root endpoint with basic API info."""
-    return {
-        "message": "Chat Backend API",
-        "version": getattr(request.app, "version", "unknown"),
-        "endpoints": {
-            "chat": "/chat",
-            "chat_stream": "/chat/stream",
-            "websocket": "/ws/{client_id}",
-            "docs": "/docs",
-        },
-    }
+    """Root endpoint with basic API info (pre-serialized in create_app)."""
+    return Response(
+        content=request.app.state.root_response, media_type="application/json"
+    )
 
 
 @router.post("/chat")
@@ -125,7 +172,7 @@ async def chat_endpoint(request_body: Dict[str, Any]):
 
     except Exception as e:
         logger.error(f"Chat endpoint error: {e}", exc_info=True)
-        return JSONResponse(status_code=500, content={"error": f"{e}"})
+        return ORJSONResponse(status_code=500, content={"error": f"{e}"})
 
 
 @router.post("/chat/stream")
@@ -146,7 +193,8 @@ async def chat_stream_endpoint(request_body: Dict[str, Any]):
                     user_id=user_id,
                     conversation_id=f"stream_{datetime.now().timestamp()}",
                 ):
-                    yield f"data: {json.dumps(chunk.dict())}\n\n".encode("utf-8")
+                    # pydantic-core serializes directly (datetime included)
+                    yield b"data: " + chunk.model_dump_json().encode() + b"\n\n"
             except Exception as stream_error:
                 logger.error(f"Streaming error: {stream_error}", exc_info=True)
                 payload = {"type": "error", "content": str(stream_error)}
@@ -156,7 +204,58 @@ async def chat_stream_endpoint(request_body: Dict[str, Any]):
 
     except Exception as e:
         logger.error(f"Streaming endpoint error: {e}", exc_info=True)
-        return JSONResponse(status_code=500, content={"error": f"{e}"})
+        return ORJSONResponse(status_code=500, content={"error": f"{e}"})
+
+
+@router.post("/chat/async", status_code=202)
+async def chat_async_endpoint(request_body: Dict[str, Any], request: Request):
+    """
+    Queued chat endpoint.
+    Enqueues the message on the TaskEngine and returns the task id immediately;
+    the result is available via /tasks/{task_id} once a worker has processed it.
+    """
+    engine: Optional[TaskEngine] = getattr(request.app.state, "task_engine", None)
+    if engine is None or not engine.is_running:
+        return ORJSONResponse(
+            status_code=503, content={"error": "Task engine not available"}
+        )
+
+    # Backpressure: reject instead of buffering when the queue is full
+    if engine.task_queue.full():
+        return ORJSONResponse(status_code=429, content={"error": "Task queue is full"})
+
+    try:
+        message_data = {
+            "type": "message",
+            "content": request_body.get("content", ""),
+        }
+        event = MessageEvent(message_data, request_body.get("user_id", "anonymous"))
+        task = MessageTaskFactory.create_task(event)
+        task_id = await engine.submit_task(task, TaskInput(data=message_data))
+
+        return {"task_id": task_id, "status": "queued"}
+
+    except Exception as e:
+        logger.error(f"Async chat endpoint error: {e}", exc_info=True)
+        return ORJSONResponse(status_code=503, content={"error": f"{e}"})
+
+
+@router.get("/tasks/{task_id}")
+async def task_status_endpoint(task_id: str, request: Request):
+    """Status (and result, once completed) of a task submitted via /chat/async."""
+    engine: Optional[TaskEngine] = getattr(request.app.state, "task_engine", None)
+    if engine is None:
+        return ORJSONResponse(
+            status_code=503, content={"error": "Task engine not available"}
+        )
+
+    task = engine.tasks.get(task_id) or engine.completed_tasks.get(task_id)
+    if task is None:
+        return ORJSONResponse(status_code=404, content={"error": "Unknown task"})
+
+    info = task.to_dict()
+    info["result"] = task.output.get_result() if task.output else None
+    return info
 
 
 @router.websocket("/ws/{client_id}")
@@ -178,25 +277,23 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
             message_type = message_data.get("type", "message")
 
-            if message_type == "message":
-                await handle_normal_chat_message(websocket, client_id, message_data)
-            elif message_type == "stream_request":
-                await handle_streaming_chat_message(websocket, client_id, message_data)
-            elif message_type == "ping":
-                await handle_ping_message(websocket, client_id, message_data)
-            elif message_type == "status":
-                await handle_status_message(websocket, client_id, message_data)
-            else:
+            handler = WS_MESSAGE_HANDLERS.get(message_type)
+            if handler is None:
                 await send_error_response(
                     websocket, f"Unknown message type: {message_type}"
                 )
+                continue
+
+            await handler(websocket, client_id, message_data)
 
     except WebSocketDisconnect:
-        manager.disconnect(client_id)
         logger.info(f"Client {client_id} disconnected")
     except Exception as e:
         logger.error(f"WS error for client {client_id}: {e}", exc_info=True)
-        manager.disconnect(client_id)
+    finally:
+        # Unregister on cancellation too (e.g. at shutdown), but keep a newer
+        # connection of the same client in place
+        manager.disconnect(client_id, websocket)
 
 
 # -----------------------------------------------------------------------------
@@ -339,6 +436,15 @@ async def send_error_response(websocket: WebSocket, error_message: str):
         logger.error(f"Could not send WS error message: {e}", exc_info=True)
 
 
+# Dispatch table: WebSocket message type -> handler
+WS_MESSAGE_HANDLERS = {
+    "message": handle_normal_chat_message,
+    "stream_request": handle_streaming_chat_message,
+    "ping": handle_ping_message,
+    "status": handle_status_message,
+}
+
+
 # -----------------------------------------------------------------------------
 # Legacy event handlers (engine-driven)
 # -----------------------------------------------------------------------------
@@ -386,10 +492,12 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # include all routes into this app instance
     app.include_router(router)
+    app.state.root_response = build_root_response(app)
 
     # store module-level reference for engine-driven callbacks
     global _app_ref
@@ -2,9 +2,16 @@
 Konfiguration für das Chat-Backend.
 """
 
+from importlib.util import find_spec
+
 from pydantic import BaseModel, Field, ConfigDict
 
 
+def _installed_or(module: str, fallback: str) -> str:
+    """Gibt den Modulnamen zurück, falls installiert, sonst den Fallback."""
+    return module if find_spec(module) is not None else fallback
+
+
 class Settings(BaseModel):
     """Konfigurationseinstellungen für das Chat-Backend."""
 
@@ -12,6 +19,14 @@ class Settings(BaseModel):
     host: str = Field(default="0.0.0.0", description="Server Host")
     port: int = Field(default=9797, description="Server Port")
     reload: bool = Field(default=True, description="Auto-Reload aktiviert")
+    event_loop: str = Field(
+        default_factory=lambda: _installed_or("uvloop", "asyncio"),
+        description="Uvicorn Event-Loop (uvloop, Fallback asyncio)",
+    )
+    http_parser: str = Field(
+        default_factory=lambda: _installed_or("httptools", "h11"),
+        description="Uvicorn HTTP-Parser (httptools, Fallback h11)",
+    )
 
     # Logging-Konfiguration
     log_level: str = Field(default="INFO", description="Log Level")
@@ -19,7 +19,7 @@ def iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-@dataclass
+@dataclass(slots=True)
 class UserMessage:
     """Message sent by a user to the system."""
 
@@ -38,8 +38,18 @@ class UserMessage:
             id=uid(), session_id=session_id, ts=iso(), type=type_, payload=payload
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the message to a dictionary without copying the payload."""
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "ts": self.ts,
+            "type": self.type,
+            "payload": self.payload,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class QueenMessage:
     """Message sent by the Queen/agent system."""
 
@@ -74,7 +84,27 @@ class QueenMessage:
             stage=stage,
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the message to a dictionary without copying the payload."""
+        return {
+            "id": self.id,
+            "correlation_id": self.correlation_id,
+            "session_id": self.session_id,
+            "ts": self.ts,
+            "type": self.type,
+            "payload": self.payload,
+            "progress_pct": self.progress_pct,
+            "stage": self.stage,
+        }
+
 
 def to_json(obj: Any) -> Dict[str, Any]:
-    """Convert an object to a JSON-serializable dictionary using asdict."""
+    """
+    Convert an object to a JSON-serializable dictionary.
+
+    Message contracts build their dictionary directly; other dataclasses
+    fall back to asdict, which deep-copies nested values.
+    """
+    if isinstance(obj, (UserMessage, QueenMessage)):
+        return obj.to_dict()
     return asdict(obj)
@@ -6,9 +6,10 @@ Enthält Datenmodelle und den Connection Manager.
 from fastapi import WebSocket
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
 import json
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Logging konfigurieren
 logger = logging.getLogger(__name__)
@@ -84,15 +85,22 @@ class ConnectionManager:
                 self.connection_count -= 1
             raise
 
-    def disconnect(self, client_id: str):
+    def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
         """
         Trennt eine WebSocket-Verbindung.
 
         Args:
             client_id: ID des zu trennenden Clients
+            websocket: Nur trennen, wenn dies noch die aktive Verbindung ist
+                (eine inzwischen ersetzte Verbindung lässt die neue bestehen)
         """
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
+        if (
+            websocket is not None
+            and self.active_connections.get(client_id) is not websocket
+        ):
+            return
+
+        if self.active_connections.pop(client_id, None) is not None:
             self.connection_count -= 1
             logger.info(
                 f"Client {client_id} disconnected. Total connections: {self.connection_count}"
@@ -120,17 +128,20 @@ class ConnectionManager:
         Args:
             message: Zu sendende Nachricht
         """
-        disconnected_clients = []
-        for client_id, connection in self.active_connections.items():
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to {client_id}: {e}")
-                disconnected_clients.append(client_id)
+        # Momentaufnahme, da sich die Verbindungen während der Sends ändern können
+        connections = list(self.active_connections.items())
+
+        # Alle Sends gleichzeitig ausführen statt nacheinander
+        results = await asyncio.gather(
+            *(connection.send_text(message) for _, connection in connections),
+            return_exceptions=True,
+        )
 
-        # Disconnected clients entfernen
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        # Clients mit fehlgeschlagenem Send in einem Durchgang entfernen
+        for (client_id, connection), result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error broadcasting to {client_id}: {result}")
+                self.disconnect(client_id, connection)
 
     def get_connection_count(self) -> int:
         """
@@ -27,6 +27,12 @@ if __name__ == "__main__":
             port=settings.port,
             log_level=settings.log_level.lower(),
             reload=settings.reload,
+            loop=settings.event_loop,
+            http=settings.http_parser,
+            # Verbindungen, Task Engine und Queen leben im Prozess - daher genau
+            # ein Worker; skaliert wird über mehrere Instanzen
+            workers=1,
+            lifespan="on",
         )
     except KeyboardInterrupt:
         logger.info("Server wird beendet...")
@@ -7,6 +7,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 from datetime import datetime
 from enum import Enum
+import time
 import uuid
 
 
@@ -144,6 +145,9 @@ class Task(ABC):
         self.created_at = datetime.now()
         self.started_at: Optional[datetime] = None
         self.completed_at: Optional[datetime] = None
+        # Monotone Zeitstempel für die Ausführungszeit (unabhängig von der Systemuhr)
+        self._started_ns: Optional[int] = None
+        self._completed_ns: Optional[int] = None
         self.input: Optional[TaskInput] = None
         self.output: Optional[TaskOutput] = None
         self.error: Optional[str] = None
@@ -163,6 +167,15 @@ class Task(ABC):
         """
         pass
 
+    async def cleanup(self) -> None:
+        """
+        Gibt Ressourcen frei, die an den Event-Loop des Tasks gebunden sind.
+
+        Wird nach execute() im selben Event-Loop aufgerufen, bevor die
+        Engine diesen schließt. Standardmäßig gibt es nichts freizugeben.
+        """
+        pass
+
     def set_input(self, task_input: TaskInput) -> None:
         """Setzt den Task-Input."""
         self.input = task_input
@@ -170,28 +183,34 @@ class Task(ABC):
     def set_output(self, task_output: TaskOutput) -> None:
         """Setzt den Task-Output."""
         self.output = task_output
-        self.completed_at = datetime.now()
+        self._mark_completed()
 
     def set_error(self, error: str) -> None:
         """Setzt eine Fehlermeldung."""
         self.error = error
         self.status = TaskStatus.FAILED
-        self.completed_at = datetime.now()
+        self._mark_completed()
 
     def start(self) -> None:
         """Markiert den Task als gestartet."""
         self.status = TaskStatus.RUNNING
         self.started_at = datetime.now()
+        self._started_ns = time.perf_counter_ns()
 
     def complete(self) -> None:
         """Markiert den Task als abgeschlossen."""
         self.status = TaskStatus.COMPLETED
-        self.completed_at = datetime.now()
+        self._mark_completed()
 
     def cancel(self) -> None:
         """Bricht den Task ab."""
         self.status = TaskStatus.CANCELLED
+        self._mark_completed()
+
+    def _mark_completed(self) -> None:
+        """Hält Abschlusszeitpunkt und monotonen Endzeitstempel fest."""
         self.completed_at = datetime.now()
+        self._completed_ns = time.perf_counter_ns()
 
     def can_retry(self) -> bool:
         """Prüft, ob der Task wiederholt werden kann."""
@@ -204,8 +223,8 @@ class Task(ABC):
 
     def get_execution_time(self) -> Optional[float]:
         """Gibt die Ausführungszeit in Sekunden zurück."""
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds()
+        if self._started_ns is not None and self._completed_ns is not None:
+            return (self._completed_ns - self._started_ns) / 1e9
         return None
 
     def to_dict(self) -> Dict[str, Any]:
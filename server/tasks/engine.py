@@ -4,20 +4,43 @@ Task Engine für die Verarbeitung von Nachrichten.
 
 import asyncio
 import logging
+import random
 import time
-from typing import Dict, Any, Optional, Callable
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Set
 from datetime import datetime
-from queue import Queue, PriorityQueue, Empty, Full
 from concurrent.futures import ThreadPoolExecutor, Future
 
 from .base import Task, TaskInput, TaskOutput, TaskStatus
 
 # from .message_tasks import MessageTask  # Zirkulärer Import entfernt
 
+# Backoff-Parameter für Fehler in den Worker-Loops
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+BACKOFF_JITTER = 0.25
+
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Berechnet die Wartezeit nach einem Fehler (exponentiell, gedeckelt, mit Jitter).
+
+    Args:
+        attempt: Anzahl der aufeinanderfolgenden Fehler (ab 0)
+
+    Returns:
+        Wartezeit in Sekunden
+    """
+    delay = min(BACKOFF_CAP, BACKOFF_BASE * (2 ** min(attempt, 16)))
+    return delay + random.uniform(0, BACKOFF_JITTER)
+
 
 class MessageEvent:
     """Repräsentiert eine eingehende Nachricht als Event."""
 
+    # Pro Nachricht erzeugt - ohne __dict__ deutlich kleiner
+    __slots__ = ("message_data", "client_id", "timestamp", "event_id")
+
     def __init__(
         self, message_data: dict, client_id: str, timestamp: Optional[datetime] = None
     ):
@@ -43,7 +66,7 @@ class GlobalEventManager:
 
     def __init__(self, task_engine: "TaskEngine"):
         self.task_engine = task_engine
-        self.message_queue: Queue[MessageEvent] = Queue(maxsize=10000)
+        self.message_queue: asyncio.Queue[MessageEvent] = asyncio.Queue(maxsize=10000)
         self.is_running = False
         self.logger = logging.getLogger(f"{__name__}.GlobalEventManager")
 
@@ -53,12 +76,11 @@ class GlobalEventManager:
         # Callbacks für verschiedene Nachrichtentypen
         self.message_handlers: Dict[str, Callable[[MessageEvent], None]] = {}
 
-        # Statistiken
+        # Statistiken (queue_size wird erst in get_stats() ermittelt)
         self.stats = {
             "total_messages": 0,
             "processed_messages": 0,
             "failed_messages": 0,
-            "queue_size": 0,
         }
 
     async def start(self) -> None:
@@ -109,10 +131,11 @@ class GlobalEventManager:
             self.message_queue.put_nowait(message_event)
 
             self.stats["total_messages"] += 1
-            self.stats["queue_size"] = self.message_queue.qsize()
 
             self.logger.debug(
-                f"Nachricht von {client_id} zur Queue hinzugefügt: {message_event.event_id}"
+                "Nachricht von %s zur Queue hinzugefügt: %s",
+                client_id,
+                message_event.event_id,
             )
             return message_event.event_id
 
@@ -136,29 +159,26 @@ class GlobalEventManager:
     async def _message_worker_loop(self) -> None:
         """Hauptschleife des Message Workers."""
         self.logger.info("Message Worker gestartet")
+        error_count = 0
 
         while self.is_running:
             try:
-                # Nachricht aus der Queue holen
-                try:
-                    message_event = self.message_queue.get_nowait()
-                    self.stats["queue_size"] = self.message_queue.qsize()
-                except Empty:
-                    # Keine Nachrichten verfügbar, kurz warten
-                    await asyncio.sleep(0.1)
-                    continue
+                # Auf die nächste Nachricht warten (kein Polling)
+                message_event = await self.message_queue.get()
 
                 # Nachricht verarbeiten
                 await self._process_message(message_event)
+                error_count = 0
 
             except Exception as e:
                 self.logger.error(f"Fehler im Message Worker Loop: {e}")
-                await asyncio.sleep(1)
+                await asyncio.sleep(_backoff_delay(error_count))
+                error_count += 1
 
     async def _process_message(self, message_event: MessageEvent) -> None:
         """Verarbeitet eine einzelne Nachricht."""
         try:
-            self.logger.debug(f"Verarbeite Nachricht: {message_event.event_id}")
+            self.logger.debug("Verarbeite Nachricht: %s", message_event.event_id)
 
             # Nachrichtentyp extrahieren
             message_type = message_event.message_data.get("type", "unknown")
@@ -169,7 +189,7 @@ class GlobalEventManager:
                     self.message_handlers[message_type](message_event)
                     self.stats["processed_messages"] += 1
                     self.logger.debug(
-                        f"Nachricht {message_event.event_id} erfolgreich verarbeitet"
+                        "Nachricht %s erfolgreich verarbeitet", message_event.event_id
                     )
                 except Exception as e:
                     self.logger.error(
@@ -206,13 +226,16 @@ class TaskEngine:
     mit einem Threadpool aus.
     """
 
-    def __init__(self, max_workers: int = 4, queue_size: int = 1000):
+    def __init__(
+        self, max_workers: int = 4, queue_size: int = 1000, history_size: int = 1000
+    ):
         """
         Initialisiert die Task Engine.
 
         Args:
             max_workers: Maximale Anzahl von Worker-Threads
             queue_size: Maximale Größe der Task-Warteschlange
+            history_size: Anzahl abgeschlossener Tasks, die abrufbar bleiben
         """
         if queue_size <= 0:
             raise ValueError("Queue-Größe muss größer als 0 sein")
@@ -222,9 +245,12 @@ class TaskEngine:
 
         self.max_workers = max_workers
         self.queue_size = queue_size
+        self.history_size = history_size
 
         # Priority Queue für Tasks
-        self.task_queue = PriorityQueue(maxsize=queue_size)
+        self.task_queue: asyncio.PriorityQueue[Task] = asyncio.PriorityQueue(
+            maxsize=queue_size
+        )
 
         # Threadpool für Task-Execution
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
@@ -232,7 +258,8 @@ class TaskEngine:
         # Task-Verwaltung
         self.tasks: Dict[str, Task] = {}
         self.running_tasks: Dict[str, Future] = {}
-        self.completed_tasks: Dict[str, Task] = {}
+        # Abgeschlossene Tasks, begrenzt auf history_size (älteste zuerst)
+        self.completed_tasks: "OrderedDict[str, Task]" = OrderedDict()
 
         # Engine-Status
         self.is_running = False
@@ -240,6 +267,9 @@ class TaskEngine:
 
         # Event Loop für asynchrone Operationen
         self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.worker_tasks: List[asyncio.Task] = []
+        # Laufende Task-Ausführungen, auf die stop() vor dem Herunterfahren wartet
+        self.inflight_executions: Set[asyncio.Task] = set()
 
         # Callbacks
         self.on_task_completed: Optional[Callable[[Task], None]] = None
@@ -248,13 +278,12 @@ class TaskEngine:
         # Logging
         self.logger = logging.getLogger(f"{__name__}.TaskEngine")
 
-        # Statistiken
+        # Statistiken (queue_size wird erst in get_stats() ermittelt)
         self.stats = {
             "total_tasks": 0,
             "completed_tasks": 0,
             "failed_tasks": 0,
             "cancelled_tasks": 0,
-            "queue_size": 0,
         }
 
         # Global Event Manager
@@ -269,8 +298,11 @@ class TaskEngine:
         self.is_running = True
         self.loop = asyncio.get_event_loop()
 
-        # Worker-Task starten
-        asyncio.create_task(self._worker_loop())
+        # Ein Worker-Task pro Thread, damit bis zu max_workers Tasks parallel
+        # laufen, statt dass ein langsamer Task alle nachfolgenden blockiert
+        self.worker_tasks = [
+            asyncio.create_task(self._worker_loop()) for _ in range(self.max_workers)
+        ]
 
         # Global Event Manager starten
         await self.event_manager.start()
@@ -288,10 +320,19 @@ class TaskEngine:
         # Global Event Manager stoppen
         await self.event_manager.stop()
 
-        # Alle laufenden Tasks abbrechen
+        # Worker stoppen (sie warten sonst unbegrenzt auf die Queue)
+        for worker_task in self.worker_tasks:
+            worker_task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+
+        # Noch nicht gestartete Tasks im Threadpool abbrechen
         for task_id, future in self.running_tasks.items():
             future.cancel()
 
+        # Laufende Ausführungen ihr Ergebnis noch verbuchen lassen
+        await asyncio.gather(*self.inflight_executions, return_exceptions=True)
+
         # Threadpool herunterfahren
         self.executor.shutdown(wait=True)
         self.is_shutdown = True
@@ -326,14 +367,15 @@ class TaskEngine:
         try:
             self.task_queue.put_nowait(task)
             self.stats["total_tasks"] += 1
-            self.stats["queue_size"] = self.task_queue.qsize()
 
             self.logger.debug(
-                f"Task {task.task_id} zur Queue hinzugefügt (Priorität: {task.priority.name})"
+                "Task %s zur Queue hinzugefügt (Priorität: %s)",
+                task.task_id,
+                task.priority.name,
             )
             return task.task_id
 
-        except Full:
+        except asyncio.QueueFull:
             self.logger.error(
                 f"Queue voll - Task {task.task_id} kann nicht hinzugefügt werden"
             )
@@ -402,7 +444,6 @@ class TaskEngine:
             {
                 "queue_size": self.get_queue_size(),
                 "running_tasks": len(self.running_tasks),
-                "total_tasks": len(self.tasks) + len(self.completed_tasks),
                 "is_running": self.is_running,
                 "is_shutdown": self.is_shutdown,
             }
@@ -411,30 +452,32 @@ class TaskEngine:
 
     async def _worker_loop(self) -> None:
         """Hauptschleife der Worker-Threads."""
+        error_count = 0
+
         while self.is_running:
             try:
-                # Task aus der Queue holen
-                try:
-                    task = self.task_queue.get_nowait()
-                    self.stats["queue_size"] = self.task_queue.qsize()
-                except Empty:
-                    # Keine Tasks verfügbar, kurz warten
-                    await asyncio.sleep(0.1)
-                    continue
+                # Auf den nächsten Task warten (kein Polling)
+                task = await self.task_queue.get()
 
-                # Task ausführen
-                await self._execute_task(task)
+                # Task ausführen; shield, damit stop() nur den Worker abbricht
+                # und die Ausführung selbst in stop() zu Ende abgewartet wird
+                execution = asyncio.create_task(self._execute_task(task))
+                self.inflight_executions.add(execution)
+                execution.add_done_callback(self.inflight_executions.discard)
+                await asyncio.shield(execution)
+                error_count = 0
 
             except Exception as e:
                 self.logger.error(f"Fehler im Worker-Loop: {e}")
-                await asyncio.sleep(1)
+                await asyncio.sleep(_backoff_delay(error_count))
+                error_count += 1
 
     async def _execute_task(self, task: Task) -> None:
         """Führt einen einzelnen Task aus."""
         try:
             # Task als laufend markieren
             task.start()
-            self.logger.debug(f"Starte Task {task.task_id}")
+            self.logger.debug("Starte Task %s", task.task_id)
 
             # Task im Threadpool ausführen
             future = self.executor.submit(self._run_task_sync, task, task.input)
@@ -455,9 +498,7 @@ class TaskEngine:
                 raise Exception(result.get_error())
 
             # Task zu completed_tasks verschieben
-            if task.task_id in self.tasks:
-                del self.tasks[task.task_id]
-            self.completed_tasks[task.task_id] = task
+            self._archive_task(task)
 
             # Aus running_tasks entfernen
             if task.task_id in self.running_tasks:
@@ -473,7 +514,7 @@ class TaskEngine:
                 except Exception as e:
                     self.logger.error(f"Fehler im on_task_completed Callback: {e}")
 
-            self.logger.debug(f"Task {task.task_id} erfolgreich abgeschlossen")
+            self.logger.debug("Task %s erfolgreich abgeschlossen", task.task_id)
 
         except Exception as e:
             # Fehlerbehandlung
@@ -482,6 +523,7 @@ class TaskEngine:
 
             # Statistiken aktualisieren
             self.stats["failed_tasks"] += 1
+            self._archive_task(task)
 
             # Aus running_tasks entfernen
             if task.task_id in self.running_tasks:
@@ -498,6 +540,14 @@ class TaskEngine:
 
             self.logger.error(f"Task {task.task_id} fehlgeschlagen: {error_msg}")
 
+    def _archive_task(self, task: Task) -> None:
+        """Verschiebt einen beendeten Task in die begrenzte Historie."""
+        self.tasks.pop(task.task_id, None)
+        self.completed_tasks[task.task_id] = task
+
+        while len(self.completed_tasks) > self.history_size:
+            self.completed_tasks.popitem(last=False)
+
     def _run_task_sync(self, task: Task, task_input: TaskInput) -> TaskOutput:
         """
         Führt einen Task synchron aus (wird im Threadpool ausgeführt).
@@ -522,8 +572,14 @@ class TaskEngine:
             # Fehler-Output erstellen
             return TaskOutput(result=None, success=False, error=str(e))
         finally:
-            # Event Loop schließen
+            # Loop-gebundene Ressourcen des Tasks freigeben, dann Event Loop schließen
             if loop and not loop.is_closed():
+                try:
+                    loop.run_until_complete(task.cleanup())
+                except Exception as e:
+                    self.logger.warning(
+                        f"Fehler beim Cleanup von Task {task.task_id}: {e}"
+                    )
                 loop.close()
 
     def set_callbacks(
@@ -8,7 +8,8 @@ from datetime import datetime
 
 from .base import Task, TaskInput, TaskOutput, TaskPriority
 from .engine import MessageEvent
-from server.agents.queen_agent import get_queen_instance
+from server.agents.queen_agent import get_queen_instance, release_queen_instance
+from server.agents.ollama_agent import close_shared_session
 
 
 class ChatMessageTask(Task):
@@ -74,6 +75,13 @@ class ChatMessageTask(Task):
 
             return TaskOutput(result=None, success=False, error=error_msg)
 
+    async def cleanup(self) -> None:
+        """Gibt die Queen und die HTTP-Session des Task-Loops frei."""
+        queen = release_queen_instance()
+        if queen is not None:
+            await queen.cleanup()
+        await close_shared_session()
+
 
 class PingMessageTask(Task):
     """
@@ -95,7 +103,7 @@ class PingMessageTask(Task):
         """Führt die Ping-Nachrichtenverarbeitung aus."""
         try:
             self.logger.debug(
-                f"Verarbeite Ping-Nachricht: {self.message_event.event_id}"
+                "Verarbeite Ping-Nachricht: %s", self.message_event.event_id
             )
 
             client_id = self.message_event.client_id
@@ -109,7 +117,8 @@ class PingMessageTask(Task):
             }
 
             self.logger.debug(
-                f"Ping-Nachricht erfolgreich verarbeitet: {self.message_event.event_id}"
+                "Ping-Nachricht erfolgreich verarbeitet: %s",
+                self.message_event.event_id,
             )
 
             return TaskOutput(result=result, success=True)
@@ -141,7 +150,7 @@ class StatusMessageTask(Task):
         """Führt die Status-Nachrichtenverarbeitung aus."""
         try:
             self.logger.debug(
-                f"Verarbeite Status-Anfrage: {self.message_event.event_id}"
+                "Verarbeite Status-Anfrage: %s", self.message_event.event_id
             )
 
             client_id = self.message_event.client_id
@@ -161,7 +170,8 @@ class StatusMessageTask(Task):
             }
 
             self.logger.debug(
-                f"Status-Anfrage erfolgreich verarbeitet: {self.message_event.event_id}"
+                "Status-Anfrage erfolgreich verarbeitet: %s",
+                self.message_event.event_id,
             )
 
             return TaskOutput(result=result, success=True)
@@ -178,6 +188,13 @@ class MessageTaskFactory:
     Factory für die Erstellung von Message-Tasks basierend auf dem Nachrichtentyp.
     """
 
+    # Nachrichtentyp -> Task-Klasse
+    TASK_TYPES = {
+        "message": ChatMessageTask,
+        "ping": PingMessageTask,
+        "status": StatusMessageTask,
+    }
+
     @staticmethod
     def create_task(message_event: MessageEvent) -> Task:
         """
@@ -191,12 +208,6 @@ class MessageTaskFactory:
         """
         message_type = message_event.message_data.get("type", "unknown")
 
-        if message_type == "message":
-            return ChatMessageTask(message_event)
-        elif message_type == "ping":
-            return PingMessageTask(message_event)
-        elif message_type == "status":
-            return StatusMessageTask(message_event)
-        else:
-            # Fallback für unbekannte Nachrichtentypen
-            return ChatMessageTask(message_event)
+        # Fallback für unbekannte Nachrichtentypen: ChatMessageTask
+        task_class = MessageTaskFactory.TASK_TYPES.get(message_type, ChatMessageTask)
+        return task_class(message_event)
@@ -9,7 +9,8 @@ from datetime import datetime
 
 from .base import Task, TaskInput, TaskOutput, TaskPriority
 from .engine import MessageEvent
-from server.agents.queen_agent import get_queen_instance
+from server.agents.queen_agent import get_queen_instance, release_queen_instance
+from server.agents.ollama_agent import close_shared_session
 
 
 class StreamingChatMessageTask(Task):
@@ -117,3 +118,10 @@ class StreamingChatMessageTask(Task):
             self.logger.error(error_msg)
 
             return TaskOutput(result=None, success=False, error=error_msg)
+
+    async def cleanup(self) -> None:
+        """Gibt die Queen und die HTTP-Session des Task-Loops frei."""
+        queen = release_queen_instance()
+        if queen is not None:
+            await queen.cleanup()
+        await close_shared_session()
@@ -7,7 +7,7 @@ import pytest
 import asyncio
 import sys
 import os
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 import json
@@ -21,6 +21,8 @@ try:
     from server.core import ConnectionManager
     from server.tasks.engine import TaskEngine, GlobalEventManager
     from server.tasks.base import TaskInput, TaskOutput, TaskStatus, TaskPriority
+    from server.agents.ollama_agent import get_shared_session
+    from server.agents.queen_agent import QueenAgent
 except ImportError as e:
     print(f"Import-Fehler: {e}")
     print("Stelle sicher, dass alle Server-Module verfügbar sind.")
@@ -199,6 +201,20 @@ def websocket_test_client():
     return WebSocketTestClient()
 
 
+@pytest.fixture
+def fake_queen_initialize():
+    """Ersetzt QueenAgent.initialize durch eine Variante ohne Ollama-Server."""
+    async def fake_initialize(self):
+        # Session öffnen wie im echten Agent, sie referenziert den Event-Loop
+        self.session = get_shared_session(self.config)
+        self.is_initialized = True
+        self.is_queen_active = True
+        return True
+    
+    with patch.object(QueenAgent, "initialize", fake_initialize):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def setup_logging():
     """Konfiguriert Logging für Tests."""
@@ -0,0 +1,389 @@
+"""
+Unit Tests für die Agent-Komponenten.
+Testet Batch-Generierung und das Verhalten des Ollama-Agenten ohne Server.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from server.agents.base_agent import AgentResponse, AgentError, StreamChunk
+from server.agents.ollama_agent import (
+    OllamaAgent,
+    OllamaConfig,
+    _health_cache,
+    to_wire_messages,
+)
+from server.agents.queen_agent import (
+    QueenAgent,
+    QueenConfig,
+    _queen_instances,
+    get_queen_instance,
+    release_queen_instance,
+)
+from server.agents.response_cache import ResponseCache
+
+
+@pytest.fixture
+def ollama_agent():
+    """Erstellt einen initialisierten OllamaAgent ohne HTTP-Session."""
+    agent = OllamaAgent(OllamaConfig(name="test-agent", model="test-model"))
+    agent.is_initialized = True
+    return agent
+
+
+class TestGenerateBatch:
+    """Tests für BaseAgent.generate_batch."""
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_preserves_order(self, ollama_agent):
+        """Testet, dass Antworten in Eingabereihenfolge zurückkommen."""
+
+        async def fake_generate(prompt, context=None, **kwargs):
+            await asyncio.sleep(0.01 if prompt == "a" else 0)
+            return AgentResponse(content=prompt.upper(), model="test-model")
+
+        ollama_agent.generate_response = fake_generate
+
+        results = await ollama_agent.generate_batch(["a", "b", "c"])
+
+        assert [r.content for r in results] == ["A", "B", "C"]
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_respects_concurrency(self, ollama_agent):
+        """Testet, dass nie mehr Anfragen als erlaubt gleichzeitig laufen."""
+        active = 0
+        peak = 0
+
+        async def fake_generate(prompt, context=None, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return AgentResponse(content=prompt, model="test-model")
+
+        ollama_agent.generate_response = fake_generate
+
+        await ollama_agent.generate_batch([str(i) for i in range(10)], concurrency=3)
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_returns_exceptions(self, ollama_agent):
+        """Testet, dass einzelne Fehler den Batch nicht abbrechen."""
+        ollama_agent.generate_response = AsyncMock(
+            side_effect=[
+                AgentResponse(content="ok", model="test-model"),
+                AgentError("kaputt", "test-agent"),
+            ]
+        )
+
+        results = await ollama_agent.generate_batch(["x", "y"], concurrency=1)
+
+        assert results[0].content == "ok"
+        assert isinstance(results[1], AgentError)
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_invalid_concurrency(self, ollama_agent):
+        """Testet die Validierung des Concurrency-Limits."""
+        with pytest.raises(ValueError):
+            await ollama_agent.generate_batch(["x"], concurrency=0)
+
+
+class TestHealthCache:
+    """Tests für den gecachten Health-Check des Ollama-Agenten."""
+
+    @pytest.fixture(autouse=True)
+    def clear_health_cache(self):
+        """Leert den globalen Health-Cache vor und nach jedem Test."""
+        _health_cache.clear()
+        yield
+        _health_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_cached_health_check_reuses_result(self, ollama_agent):
+        """Testet, dass ein frisches Ergebnis nicht erneut abgefragt wird."""
+        ollama_agent.health_check = AsyncMock(return_value={"status": "healthy"})
+
+        first = await ollama_agent.cached_health_check()
+        second = await ollama_agent.cached_health_check()
+
+        assert first == second == {"status": "healthy"}
+        ollama_agent.health_check.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_result_is_not_cached(self, ollama_agent):
+        """Testet, dass nach einem Fehlschlag sofort erneut geprüft wird."""
+        ollama_agent.health_check = AsyncMock(
+            side_effect=[{"status": "unhealthy"}, {"status": "healthy"}]
+        )
+
+        first = await ollama_agent.cached_health_check()
+        second = await ollama_agent.cached_health_check()
+
+        assert first["status"] == "unhealthy"
+        assert second["status"] == "healthy"
+        assert ollama_agent.base_url in _health_cache
+
+    @pytest.mark.asyncio
+    async def test_invalidate_health_forces_new_check(self, ollama_agent):
+        """Testet, dass nach einer Invalidierung erneut geprüft wird."""
+        ollama_agent.health_check = AsyncMock(return_value={"status": "healthy"})
+
+        await ollama_agent.cached_health_check()
+        ollama_agent.invalidate_health()
+        await ollama_agent.cached_health_check()
+
+        assert ollama_agent.health_check.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_request_invalidates_health(self, ollama_agent):
+        """Testet, dass ein fehlgeschlagener Request den Cache verwirft."""
+        _health_cache[ollama_agent.base_url] = (0.0, {"status": "healthy"})
+        ollama_agent.session = None  # Request schlägt ohne Session fehl
+
+        with pytest.raises(AgentError):
+            await ollama_agent.generate_response("Hallo")
+
+        assert ollama_agent.base_url not in _health_cache
+
+
+class TestQueenSystemPrompt:
+    """Tests für die System-Prompt-Erweiterung der Queen."""
+
+    def test_style_and_context_enhancements(self):
+        """Testet Stil- und Kontext-Ergänzungen des System-Prompts."""
+        queen = QueenAgent()
+
+        plain = queen._enhance_system_prompt("Hallo")
+        coding = queen._enhance_system_prompt("Ich schreibe PYTHON Code")
+        science = queen._enhance_system_prompt("Ich forsche in der Physik")
+
+        assert plain.startswith(queen.config.system_prompt)
+        assert "freundlichen und warmen Ton" in plain
+        assert "Programmierung" in coding
+        assert "Wissenschaft" in science
+
+    def test_style_change_is_reflected(self):
+        """Testet, dass ein Stilwechsel im System-Prompt ankommt."""
+        queen = QueenAgent()
+        queen._enhance_system_prompt("Hallo")
+
+        queen.update_queen_style("formal")
+
+        assert "formellen Ton" in queen._enhance_system_prompt("Hallo")
+
+
+class TestQueenStreaming:
+    """Tests für das Streaming der Queen."""
+
+    @pytest.mark.asyncio
+    async def test_stream_generates_once_and_stores_full_response(self):
+        """Testet, dass die Antwort nur einmal generiert und vollständig gemerkt wird."""
+        queen = QueenAgent()
+        queen.is_queen_active = True
+        calls = 0
+
+        async def fake_stream(prompt, context=None, on_chunk=None, **kwargs):
+            nonlocal calls
+            calls += 1
+            for text, done in (("Hal", False), ("lo", True)):
+                yield StreamChunk(content=text, done=done, model="test-model")
+
+        queen.generate_response_stream = fake_stream
+
+        chunks = [
+            chunk async for chunk in queen.chat_response_stream("Hi", user_id="u1")
+        ]
+
+        assert [c.content for c in chunks] == ["Hal", "lo"]
+        assert calls == 1
+        assert queen.conversation_memory[-1]["content"] == "Hallo"
+
+
+class TestQueenContext:
+    """Tests für die Trennung der Konversationserinnerung."""
+
+    @pytest.mark.asyncio
+    async def test_context_contains_only_own_conversation(self):
+        """Testet, dass fremde Konversationen nicht in den Prompt gelangen."""
+        queen = QueenAgent()
+        queen.is_queen_active = True
+        queen._add_to_memory("user", "Geheimnis", "alice", "conv_a")
+        queen._add_to_memory("assistant", "Notiert", "alice", "conv_a")
+        queen.generate_response = AsyncMock(
+            return_value=AgentResponse(content="Hallo Bob", model="test-model")
+        )
+
+        await queen.chat_response("Hallo", user_id="bob", conversation_id="conv_b")
+
+        context = queen.generate_response.await_args.kwargs["context"]
+        assert [msg["content"] for msg in context] == ["Hallo"]
+
+    def test_context_disabled(self):
+        """Testet, dass ohne Kontext-Bewusstsein kein Kontext übergeben wird."""
+        queen = QueenAgent()
+        queen.context_awareness = False
+        queen._add_to_memory("user", "Hallo", "alice", "conv_a")
+
+        assert queen._conversation_context("alice", "conv_a") is None
+
+
+class TestRequestCoalescing:
+    """Tests für das Zusammenführen identischer deterministischer Anfragen."""
+
+    @pytest.fixture
+    def deterministic_agent(self, ollama_agent):
+        """Agent mit temperature == 0 und eigenem, leerem Cache."""
+        ollama_agent.config.temperature = 0
+        ollama_agent.response_cache = ResponseCache()
+        return ollama_agent
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(
+        self, deterministic_agent
+    ):
+        """Testet, dass gleichzeitige identische Anfragen nur einen Request auslösen."""
+
+        async def slow_post(generate_params):
+            await asyncio.sleep(0.01)
+            return {"content": "Antwort", "model": "test-model"}
+
+        deterministic_agent._post_generate = AsyncMock(side_effect=slow_post)
+
+        first, second = await asyncio.gather(
+            deterministic_agent.generate_response("Hallo"),
+            deterministic_agent.generate_response("Hallo"),
+        )
+
+        assert first.content == second.content == "Antwort"
+        deterministic_agent._post_generate.assert_awaited_once()
+        assert len(deterministic_agent.response_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, deterministic_agent):
+        """Testet, dass der Abbruch des ersten Aufrufers die Wartenden nicht trifft."""
+
+        async def slow_post(generate_params):
+            await asyncio.sleep(0.05)
+            return {"content": "Antwort", "model": "test-model"}
+
+        deterministic_agent._post_generate = AsyncMock(side_effect=slow_post)
+
+        leader = asyncio.create_task(deterministic_agent.generate_response("Hallo"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(deterministic_agent.generate_response("Hallo"))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        response = await follower
+
+        assert leader.cancelled()
+        assert response.content == "Antwort"
+        deterministic_agent._post_generate.assert_awaited_once()
+        assert len(deterministic_agent.response_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared_and_not_cached(self, deterministic_agent):
+        """Testet, dass ein Fehler an alle Wartenden geht und nicht gecacht wird."""
+
+        async def failing_post(generate_params):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Server weg")
+
+        deterministic_agent._post_generate = AsyncMock(side_effect=failing_post)
+
+        results = await asyncio.gather(
+            deterministic_agent.generate_response("Hallo"),
+            deterministic_agent.generate_response("Hallo"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, AgentError) for r in results)
+        deterministic_agent._post_generate.assert_awaited_once()
+        assert len(deterministic_agent.response_cache) == 0
+
+
+class TestGenerateParams:
+    """Tests für den Aufbau der Ollama-Request-Parameter."""
+
+    def test_to_wire_messages_strips_extra_fields(self):
+        """Testet, dass nur role und content übertragen werden."""
+        context = [
+            {"role": "user", "content": "Hallo", "timestamp": 1.0, "user_id": "u1"},
+            {"content": "ohne Rolle"},
+            {"role": "assistant", "content": "Hi"},
+        ]
+
+        assert to_wire_messages(context) == [
+            {"role": "user", "content": "Hallo"},
+            {"role": "assistant", "content": "Hi"},
+        ]
+
+    def test_build_generate_params(self, ollama_agent):
+        """Testet Optionen, Streaming-Flag und Kontext in den Parametern."""
+        ollama_agent.config.max_tokens = 64
+        ollama_agent.options = {"top_k": 10}
+
+        params = ollama_agent._build_generate_params(
+            "Frage", [{"role": "user", "content": "Hallo"}], stream=True, top_p=0.5
+        )
+
+        assert params["stream"] is True
+        assert params["options"]["num_predict"] == 64
+        assert params["options"]["top_p"] == 0.5
+        assert params["options"]["top_k"] == 10
+        assert params["messages"] == [{"role": "user", "content": "Hallo"}]
+
+
+class TestQueenFactory:
+    """Tests für die Factory-Funktion get_queen_instance."""
+
+    @pytest.fixture(autouse=True)
+    def clear_queen_instances(self):
+        """Leert den Instanz-Cache vor und nach jedem Test."""
+        _queen_instances.clear()
+        yield
+        _queen_instances.clear()
+
+    @pytest.mark.asyncio
+    async def test_active_queen_is_reused(self, fake_queen_initialize):
+        """Testet, dass eine aktive Standard-Queen wiederverwendet wird."""
+
+        first = await get_queen_instance()
+        second = await get_queen_instance()
+
+        assert first is second
+
+    @pytest.mark.asyncio
+    async def test_inactive_queen_is_not_cached(self):
+        """Testet, dass eine nicht erreichbare Queen beim nächsten Aufruf neu entsteht."""
+        with patch.object(QueenAgent, "initialize", AsyncMock(return_value=False)):
+            first = await get_queen_instance()
+            second = await get_queen_instance()
+
+        assert first is not second
+        assert len(_queen_instances) == 0
+
+    @pytest.mark.asyncio
+    async def test_custom_config_creates_new_instance(self, fake_queen_initialize):
+        """Testet, dass eine eigene Konfiguration immer eine neue Queen liefert."""
+
+        default_queen = await get_queen_instance()
+        custom_queen = await get_queen_instance(
+            QueenConfig(name="custom", model="llama3")
+        )
+
+        assert custom_queen is not default_queen
+        assert custom_queen.name == "custom"
+
+    @pytest.mark.asyncio
+    async def test_release_drops_cached_queen(self, fake_queen_initialize):
+        """Testet, dass release_queen_instance den Eintrag des Loops entfernt."""
+
+        queen = await get_queen_instance()
+
+        assert release_queen_instance() is queen
+        assert len(_queen_instances) == 0
+        assert release_queen_instance() is None
@@ -31,6 +31,34 @@ class TestAPICreation:
         assert "WebSocket" in app.description
 
 
+class TestLifespan:
+    """Tests für Startup und Shutdown der Anwendung."""
+    
+    def test_shutdown_waits_for_warmup_before_closing_session(self):
+        """Testet, dass der abgebrochene Warmup vor dem Schließen der Session endet."""
+        import asyncio
+        events = []
+        
+        async def hanging_warmup():
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                # Abbruch dauert, z.B. weil ein Request noch abgewickelt wird
+                await asyncio.sleep(0.05)
+                events.append("warmup_cancelled")
+                raise
+        
+        async def fake_close_session():
+            events.append("session_closed")
+        
+        with patch('server.api.warmup_queen', hanging_warmup), \
+             patch('server.api.close_shared_session', fake_close_session):
+            with TestClient(create_app()):
+                pass
+        
+        assert events == ["warmup_cancelled", "session_closed"]
+
+
 class TestHTTPEndpoints:
     """Tests für HTTP-Endpunkte."""
     
@@ -165,6 +193,32 @@ class TestHTTPEndpoints:
         # Streaming-Endpoint gibt einen Generator zurück
         assert response.status_code == 200
     
+    @patch('server.api.get_queen_instance')
+    def test_chat_stream_serializes_stream_chunks(self, mock_get_queen, client):
+        """Testet, dass echte StreamChunks (mit datetime) als SSE-Events ankommen."""
+        from server.agents.base_agent import StreamChunk
+        
+        mock_queen = Mock()
+        
+        async def mock_stream(**kwargs):
+            yield StreamChunk(content="Token1", done=False, model="test-model")
+            yield StreamChunk(content="Token2", done=True, model="test-model")
+        
+        mock_queen.chat_response_stream = mock_stream
+        mock_get_queen.return_value = mock_queen
+        
+        response = client.post("/chat/stream", json={"content": "Streaming Test"})
+        assert response.status_code == 200
+        
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines()
+            if line.startswith("data: ")
+        ]
+        assert [event["content"] for event in events] == ["Token1", "Token2"]
+        assert events[-1]["done"] is True
+        assert "timestamp" in events[0]
+    
     def test_chat_endpoint_invalid_json(self, client):
         """Testet Chat-Endpoint mit ungültigem JSON."""
         # Ungültiges JSON senden
@@ -204,6 +258,78 @@ class TestHTTPEndpoints:
         assert "type" in data
 
 
+class TestAsyncChatEndpoints:
+    """Tests für die asynchrone Chat-Verarbeitung über die Task Engine."""
+
+    @pytest.fixture
+    def engine(self):
+        """Gemockte, laufende Task Engine auf app.state."""
+        engine = Mock()
+        engine.is_running = True
+        engine.task_queue.full.return_value = False
+        engine.tasks = {}
+        engine.completed_tasks = {}
+        engine.submit_task = AsyncMock(side_effect=lambda task, task_input: task.task_id)
+        app.state.task_engine = engine
+        yield engine
+        del app.state.task_engine
+
+    @pytest.fixture
+    def client(self):
+        """TestClient für HTTP-Tests."""
+        return TestClient(app)
+
+    def test_chat_async_returns_task_id(self, engine, client):
+        """Testet, dass die Nachricht eingereiht und sofort 202 geliefert wird."""
+        response = client.post(
+            "/chat/async", json={"content": "Hallo", "user_id": "test_user"}
+        )
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "queued"
+        assert data["task_id"].startswith("chat_msg_")
+
+        task, task_input = engine.submit_task.await_args.args
+        assert task.message_event.client_id == "test_user"
+        assert task_input.data["content"] == "Hallo"
+
+    def test_chat_async_without_engine(self, client):
+        """Testet, dass ohne laufende Engine 503 zurückkommt."""
+        response = client.post("/chat/async", json={"content": "Hallo"})
+
+        assert response.status_code == 503
+
+    def test_chat_async_rejects_when_queue_full(self, engine, client):
+        """Testet, dass bei voller Queue 429 statt Pufferung zurückkommt."""
+        engine.task_queue.full.return_value = True
+
+        response = client.post("/chat/async", json={"content": "Hallo"})
+
+        assert response.status_code == 429
+        engine.submit_task.assert_not_awaited()
+
+    def test_task_status_completed(self, engine, client):
+        """Testet Status und Ergebnis eines abgeschlossenen Tasks."""
+        task = Mock()
+        task.to_dict.return_value = {"task_id": "t1", "status": "completed"}
+        task.output.get_result.return_value = {"content": "Antwort"}
+        engine.completed_tasks["t1"] = task
+
+        response = client.get("/tasks/t1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["result"] == {"content": "Antwort"}
+
+    def test_task_status_unknown(self, engine, client):
+        """Testet, dass unbekannte Tasks 404 liefern."""
+        response = client.get("/tasks/unbekannt")
+
+        assert response.status_code == 404
+
+
 class TestWebSocketEndpoints:
     """Tests für WebSocket-Endpunkte."""
     
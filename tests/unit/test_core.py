@@ -199,6 +199,29 @@ class TestConnectionManager:
         assert client_id not in connection_manager.active_connections
         assert connection_manager.connection_count == 0
     
+    @pytest.mark.asyncio
+    async def test_disconnect_replaced_connection_keeps_new_one(self, connection_manager):
+        """Testet, dass eine ersetzte Verbindung die neue nicht austrägt."""
+        client_id = "reconnecting_client"
+        old_websocket = Mock()
+        old_websocket.send_text = AsyncMock()
+        old_websocket.accept = AsyncMock()
+        new_websocket = Mock()
+        new_websocket.send_text = AsyncMock()
+        new_websocket.accept = AsyncMock()
+        
+        await connection_manager.connect(old_websocket, client_id)
+        await connection_manager.connect(new_websocket, client_id)
+        
+        # Der Handler der alten Verbindung räumt verspätet auf
+        connection_manager.disconnect(client_id, old_websocket)
+        assert connection_manager.active_connections[client_id] is new_websocket
+        assert connection_manager.connection_count == 1
+        
+        connection_manager.disconnect(client_id, new_websocket)
+        assert client_id not in connection_manager.active_connections
+        assert connection_manager.connection_count == 0
+    
     @pytest.mark.asyncio
     async def test_disconnect_nonexistent_client(self, connection_manager):
         """Testet das Trennen eines nicht existierenden Clients."""
@@ -305,6 +328,52 @@ class TestConnectionManager:
         # Sollte keine Fehler verursachen
         await connection_manager.broadcast(broadcast_message)
     
+    @pytest.mark.asyncio
+    async def test_broadcast_removes_failed_clients(self, connection_manager):
+        """Testet, dass Clients mit fehlgeschlagenem Send entfernt werden."""
+        websocket_ok = Mock()
+        websocket_ok.send_text = AsyncMock()
+        websocket_ok.accept = AsyncMock()
+        
+        websocket_broken = Mock()
+        websocket_broken.send_text = AsyncMock()
+        websocket_broken.accept = AsyncMock()
+        
+        await connection_manager.connect(websocket_ok, "ok_client")
+        await connection_manager.connect(websocket_broken, "broken_client")
+        websocket_broken.send_text.side_effect = Exception("Verbindung weg")
+        
+        await connection_manager.broadcast("Broadcast mit Fehler")
+        
+        websocket_ok.send_text.assert_called_with("Broadcast mit Fehler")
+        assert "broken_client" not in connection_manager.active_connections
+        assert "ok_client" in connection_manager.active_connections
+        assert connection_manager.connection_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_concurrently(self, connection_manager):
+        """Testet, dass die Sends an alle Clients gleichzeitig laufen."""
+        active = 0
+        peak = 0
+        
+        async def slow_send(message):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+        
+        for i in range(3):
+            websocket = Mock()
+            websocket.send_text = AsyncMock()
+            websocket.accept = AsyncMock()
+            await connection_manager.connect(websocket, f"client_{i}")
+            websocket.send_text.side_effect = slow_send
+        
+        await connection_manager.broadcast("Gleichzeitig")
+        
+        assert peak == 3
+    
     @pytest.mark.asyncio
     async def test_multiple_connections_management(self, connection_manager):
         """Testet Verwaltung mehrerer Verbindungen."""
@@ -5,12 +5,20 @@ Testet Queue-Management, Worker-Logic, Priority-Handling und Event-Management.
 
 import pytest
 import asyncio
+import threading
 import time
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
-from server.tasks.engine import TaskEngine, GlobalEventManager, MessageEvent
+from server.tasks.engine import (
+    TaskEngine,
+    GlobalEventManager,
+    MessageEvent,
+    _backoff_delay,
+    BACKOFF_CAP,
+    BACKOFF_JITTER,
+)
 from server.tasks.base import Task, TaskInput, TaskOutput, TaskStatus, TaskPriority
 
 
@@ -34,6 +42,19 @@ class MockTask(Task):
         )
 
 
+class BarrierTask(Task):
+    """Mock Task, das an einer Barriere auf weitere Tasks wartet."""
+    
+    def __init__(self, task_id: str, barrier: threading.Barrier):
+        super().__init__(task_id, TaskPriority.NORMAL)
+        self.barrier = barrier
+    
+    async def execute(self, input_data: TaskInput) -> TaskOutput:
+        """Blockiert den Worker-Thread, bis alle Tasks die Barriere erreichen."""
+        self.barrier.wait()
+        return TaskOutput(result={"task_id": self.task_id}, success=True)
+
+
 class MockFailingTask(Task):
     """Mock Task, das fehlschlägt."""
     
@@ -380,6 +401,63 @@ class TestTaskEngine:
         
         await task_engine.stop()
     
+    @pytest.mark.asyncio
+    async def test_task_engine_runs_tasks_in_parallel(self, task_engine):
+        """Testet, dass bis zu max_workers Tasks gleichzeitig laufen."""
+        await task_engine.start()
+        assert len(task_engine.worker_tasks) == task_engine.max_workers
+        
+        # Beide Tasks können erst weiterlaufen, wenn beide die Barriere
+        # erreicht haben - seriell bricht die Barriere per Timeout
+        barrier = threading.Barrier(2, timeout=5)
+        tasks = [BarrierTask(f"parallel_task_{i}", barrier) for i in range(2)]
+        task_input = TaskInput(data={"test": "data"})
+        for task in tasks:
+            await task_engine.submit_task(task, task_input)
+        
+        for _ in range(500):
+            if len(task_engine.completed_tasks) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await task_engine.stop()
+        
+        assert all(task.status == TaskStatus.COMPLETED for task in tasks)
+        assert not barrier.broken
+    
+    @pytest.mark.asyncio
+    async def test_task_engine_picks_up_tasks_without_polling(self, task_engine):
+        """Testet, dass wartende Worker sofort geweckt werden und stop() sie beendet."""
+        await task_engine.start()
+        await asyncio.sleep(0.01)  # Worker warten jetzt auf die Queue
+        workers = list(task_engine.worker_tasks)
+        
+        task = MockTask("wakeup_task", execution_time=0.2)
+        await task_engine.submit_task(task, TaskInput(data={}))
+        await asyncio.sleep(0.02)
+        
+        assert task.status == TaskStatus.RUNNING
+        
+        await task_engine.stop()
+        assert all(worker.done() for worker in workers)
+        assert task_engine.worker_tasks == []
+    
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_running_task(self, task_engine):
+        """Testet, dass stop() laufende Tasks noch abschließen und verbuchen lässt."""
+        await task_engine.start()
+        
+        task = MockTask("stop_running_task", execution_time=0.2)
+        await task_engine.submit_task(task, TaskInput(data={}))
+        await asyncio.sleep(0.05)
+        assert task.status == TaskStatus.RUNNING
+        
+        await task_engine.stop()
+        
+        assert "stop_running_task" in task_engine.completed_tasks
+        assert task.status == TaskStatus.COMPLETED
+        assert task_engine.stats["completed_tasks"] == 1
+        assert task_engine.inflight_executions == set()
+    
     @pytest.mark.asyncio
     async def test_task_engine_queue_overflow(self, task_engine):
         """Testet Queue-Überlauf-Behandlung."""
@@ -596,3 +674,144 @@ class TestTaskEngineEdgeCases:
         assert slow_task.status == TaskStatus.COMPLETED, f"Task Status ist {slow_task.status}, erwartet COMPLETED"
         
         await task_engine.stop()
+
+
+class TestBackoffDelay:
+    """Tests für das Backoff der Worker-Loops."""
+    
+    def test_backoff_grows_exponentially(self):
+        """Testet, dass die Wartezeit mit jedem Fehler wächst."""
+        with patch("server.tasks.engine.random.uniform", return_value=0.0):
+            delays = [_backoff_delay(attempt) for attempt in range(4)]
+        
+        assert delays == [0.5, 1.0, 2.0, 4.0]
+    
+    def test_backoff_is_capped(self):
+        """Testet, dass die Wartezeit gedeckelt ist (inklusive Jitter)."""
+        for attempt in (5, 10, 1000):
+            assert _backoff_delay(attempt) <= BACKOFF_CAP + BACKOFF_JITTER
+
+
+class TestTaskCleanup:
+    """Tests für das Cleanup von Tasks im Task-Loop."""
+    
+    def test_cleanup_runs_on_task_loop(self):
+        """Testet, dass cleanup() im selben Event-Loop wie execute() läuft."""
+        
+        class LoopRecordingTask(MockTask):
+            async def execute(self, input_data):
+                self.execute_loop = asyncio.get_running_loop()
+                return await super().execute(input_data)
+            
+            async def cleanup(self):
+                self.cleanup_loop = asyncio.get_running_loop()
+        
+        task_engine = TaskEngine(max_workers=1, queue_size=10)
+        task = LoopRecordingTask("cleanup_task", execution_time=0)
+        
+        result = task_engine._run_task_sync(task, TaskInput(data={}))
+        
+        assert result.is_success()
+        assert task.cleanup_loop is task.execute_loop
+        assert task.cleanup_loop.is_closed()
+        task_engine.executor.shutdown(wait=False)
+    
+    def test_cleanup_errors_do_not_fail_task(self):
+        """Testet, dass Fehler im Cleanup das Task-Ergebnis nicht verändern."""
+        
+        class FailingCleanupTask(MockTask):
+            async def cleanup(self):
+                raise RuntimeError("cleanup kaputt")
+        
+        task_engine = TaskEngine(max_workers=1, queue_size=10)
+        task = FailingCleanupTask("failing_cleanup_task", execution_time=0)
+        
+        result = task_engine._run_task_sync(task, TaskInput(data={}))
+        
+        assert result.is_success()
+        task_engine.executor.shutdown(wait=False)
+
+
+class TestTaskExecutionTime:
+    """Tests für die Messung der Ausführungszeit."""
+    
+    def test_execution_time_uses_monotonic_clock(self):
+        """Testet, dass die Ausführungszeit aus perf_counter_ns berechnet wird."""
+        task = MockTask("timed_task")
+        
+        with patch("server.tasks.base.time.perf_counter_ns", side_effect=[1_000_000_000, 3_500_000_000]):
+            task.start()
+            task.complete()
+        
+        assert task.get_execution_time() == 2.5
+        assert task.to_dict()["execution_time"] == 2.5
+    
+    def test_execution_time_none_before_completion(self):
+        """Testet, dass ohne Abschluss keine Ausführungszeit vorliegt."""
+        task = MockTask("running_task")
+        task.start()
+        
+        assert task.get_execution_time() is None
+
+
+class TestTaskHistory:
+    """Tests für die begrenzte Historie abgeschlossener Tasks."""
+    
+    @pytest.mark.asyncio
+    async def test_completed_tasks_are_bounded(self):
+        """Testet, dass nur die neuesten history_size Tasks behalten werden."""
+        task_engine = TaskEngine(max_workers=1, queue_size=10, history_size=2)
+        await task_engine.start()
+        
+        tasks = [MockTask(f"history_task_{i}", execution_time=0) for i in range(3)]
+        for task in tasks:
+            await task_engine.submit_task(task, TaskInput(data={}))
+        await asyncio.sleep(0.3)
+        
+        assert list(task_engine.completed_tasks) == ["history_task_1", "history_task_2"]
+        assert task_engine.tasks == {}
+        assert task_engine.get_stats()["total_tasks"] == 3
+        
+        await task_engine.stop()
+    
+    @pytest.mark.asyncio
+    async def test_failed_tasks_leave_active_tasks(self):
+        """Testet, dass fehlgeschlagene Tasks in die Historie wandern."""
+        task_engine = TaskEngine(max_workers=1, queue_size=10)
+        await task_engine.start()
+        
+        task = MockFailingTask("failed_history_task")
+        await task_engine.submit_task(task, TaskInput(data={}))
+        await asyncio.sleep(0.2)
+        
+        assert "failed_history_task" not in task_engine.tasks
+        assert task_engine.get_task_status("failed_history_task") == TaskStatus.FAILED
+        
+        await task_engine.stop()
+    
+    def test_message_event_has_no_instance_dict(self):
+        """Testet, dass MessageEvent Slots statt __dict__ verwendet."""
+        event = MessageEvent({"type": "message"}, "client")
+        
+        assert not hasattr(event, "__dict__")
+
+
+class TestTaskLoopCleanup:
+    """Tests für die Freigabe des Loop-Zustands nach Chat-Tasks."""
+
+    def test_chat_tasks_release_queen_of_task_loop(self, fake_queen_initialize):
+        """Testet, dass kurzlebige Task-Loops keine Queen zurücklassen."""
+        from server.agents.queen_agent import QueenAgent, _queen_instances
+        from server.tasks.message_tasks import ChatMessageTask
+
+        task_engine = TaskEngine(max_workers=1, queue_size=10)
+        with patch.object(
+            QueenAgent, "chat_response", AsyncMock(return_value={"response": "ok"})
+        ):
+            for i in range(5):
+                task = ChatMessageTask(MessageEvent({"content": "Hi"}, f"client_{i}"))
+                result = task_engine._run_task_sync(task, TaskInput(data={}))
+                assert result.is_success()
+
+        assert len(_queen_instances) == 0
+        task_engine.executor.shutdown(wait=False)
@@ -0,0 +1,92 @@
+"""
+Unit Tests für den Response-Cache.
+Testet Schlüsselbildung, LRU-Verdrängung und TTL-Ablauf.
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from server.agents.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Tests für die ResponseCache-Klasse."""
+
+    def test_make_key_is_order_independent(self):
+        """Testet, dass die Schlüsselbildung unabhängig von der Reihenfolge ist."""
+        url = "http://localhost:11434"
+        key1 = ResponseCache.make_key(url, {"model": "llama3", "prompt": "Hallo"})
+        key2 = ResponseCache.make_key(url, {"prompt": "Hallo", "model": "llama3"})
+        key3 = ResponseCache.make_key(url, {"prompt": "Hallo!", "model": "llama3"})
+
+        assert key1 == key2
+        assert key1 != key3
+
+    def test_make_key_includes_server(self):
+        """Testet, dass gleiche Anfragen an verschiedene Server nicht kollidieren."""
+        params = {"model": "llama3", "prompt": "Hallo"}
+
+        assert ResponseCache.make_key(
+            "http://server-a:11434", params
+        ) != ResponseCache.make_key("http://server-b:11434", params)
+
+    def test_concurrent_access_from_threads(self):
+        """Testet, dass parallele Zugriffe aus mehreren Threads nicht kollidieren."""
+        cache = ResponseCache(max_size=8)
+
+        def worker(offset):
+            for i in range(2000):
+                key = str((offset + i) % 16)
+                cache.set(key, {"content": key})
+                cache.get(key)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(worker, range(4)))
+
+        assert len(cache) <= 8
+
+    def test_get_and_set(self):
+        """Testet Hits, Misses und Statistiken."""
+        cache = ResponseCache(max_size=4)
+
+        assert cache.get("missing") is None
+        cache.set("key", {"content": "Antwort"})
+
+        assert cache.get("key") == {"content": "Antwort"}
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_lru_eviction(self):
+        """Testet, dass der am längsten unbenutzte Eintrag verdrängt wird."""
+        cache = ResponseCache(max_size=2)
+        cache.set("a", {"content": "a"})
+        cache.set("b", {"content": "b"})
+
+        # "a" wird zuletzt verwendet, "b" muss weichen
+        cache.get("a")
+        cache.set("c", {"content": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Testet, dass abgelaufene Einträge nicht zurückgegeben werden."""
+        cache = ResponseCache(max_size=2, ttl=10.0)
+
+        with patch("server.agents.response_cache.time.monotonic", return_value=100.0):
+            cache.set("key", {"content": "alt"})
+
+        with patch("server.agents.response_cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+
+        assert len(cache) == 0
+
+    def test_invalid_size(self):
+        """Testet die Validierung der Cache-Größe."""
+        with pytest.raises(ValueError):
+            ResponseCache(max_size=0)